@@ -0,0 +1,196 @@
+"""
+BIOLIT INTELLIGENCE - AUTHOR INDEX (author_index.py)
+Author -> papers inverted index with impact metrics computed from the corpus.
+
+Each author keeps the citation counts of their papers in sorted order, so the
+h-index and i10-index are maintained with binary searches as papers are
+added or superseded. Per-year trends and keyword counts are updated in place,
+and built profiles are memoized until the author's papers change, so
+repeated lookups are O(1) apart from a binary search for the percentile.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+
+from author_names import AuthorNameIndex
+from paper_store import iter_live
+from records import Author
+
+
+def author_key(name):
+    """Lookup key for an author name"""
+    return ' '.join(name.split())
+
+
+class AuthorRecord:
+    """Running aggregates for one author"""
+
+    __slots__ = ('name', 'papers', 'sorted_citations', 'total_citations', 'h_index',
+                 'publications_by_year', 'citations_by_year', 'keywords')
+
+    def __init__(self, name):
+        self.name = name
+        self.papers = {}  # row -> citations
+        self.sorted_citations = []
+        self.total_citations = 0
+        self.h_index = 0
+        self.publications_by_year = Counter()
+        self.citations_by_year = Counter()
+        self.keywords = Counter()
+
+    def count_at_least(self, citations):
+        return len(self.sorted_citations) - bisect_left(self.sorted_citations, citations)
+
+    def _update_h_index(self):
+        # Largest h with at least h papers cited h or more times
+        low, high = 0, len(self.sorted_citations)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_at_least(mid) >= mid:
+                low = mid
+            else:
+                high = mid - 1
+        self.h_index = low
+
+    def add(self, row, paper):
+        citations = paper['citations']
+        self.papers[row] = citations
+        insort(self.sorted_citations, citations)
+        self.total_citations += citations
+        self.publications_by_year[paper['year']] += 1
+        self.citations_by_year[paper['year']] += citations
+        self.keywords.update(paper['keywords'])
+        self._update_h_index()
+
+    def remove(self, row, paper):
+        citations = self.papers.pop(row)
+        del self.sorted_citations[bisect_left(self.sorted_citations, citations)]
+        self.total_citations -= citations
+        self.publications_by_year[paper['year']] -= 1
+        self.citations_by_year[paper['year']] -= citations
+        self.keywords.subtract(paper['keywords'])
+        for counter in (self.publications_by_year, self.citations_by_year, self.keywords):
+            for key in [key for key, count in counter.items() if count <= 0]:
+                del counter[key]
+        self._update_h_index()
+
+    @property
+    def i10_index(self):
+        return self.count_at_least(10)
+
+
+class AuthorIndex:
+    """Author name -> AuthorRecord, kept current as papers are ingested"""
+
+    def __init__(self, metadata=None, top_papers=5, expertise_areas=4):
+        # Curated fields (e.g. research field) that the corpus cannot provide
+        self.metadata = {author_key(name): Author.from_dict(author_key(name), info)
+                         for name, info in (metadata or {}).items()}
+        self.top_papers = top_papers
+        self.expertise_areas = expertise_areas
+        self.authors = {}
+        self.names = AuthorNameIndex()
+        # Sorted totals across all authors, for percentile ranks
+        self._all_citations = []
+        self._profiles = {}
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        index = cls(**kwargs)
+        for row, paper in iter_live(store):
+            index.add(row, paper, index_names=False)
+        index.names.set_weights((name, record.total_citations) for name, record in index.authors.items())
+        return index
+
+    def _update(self, paper, apply, index_names=True):
+        for name in dict.fromkeys(author_key(name) for name in paper['authors']):
+            record = self.authors.get(name)
+            if record is None:
+                record = self.authors[name] = AuthorRecord(name)
+            else:
+                del self._all_citations[bisect_left(self._all_citations, record.total_citations)]
+            apply(record)
+            if record.papers:
+                insort(self._all_citations, record.total_citations)
+                if index_names:
+                    self.names.set_weight(name, record.total_citations)
+            else:
+                del self.authors[name]
+                self.names.discard(name)
+            self._profiles.pop(name, None)
+
+    def add(self, row, paper, index_names=True):
+        self._update(paper, lambda record: record.add(row, paper), index_names)
+
+    def add_rows(self, store, rows, index_names=True):
+        for row in rows:
+            self.add(row, store.row(row), index_names)
+
+    def remove_row(self, store, row):
+        """Drop a superseded row from its authors' aggregates"""
+        paper = store.row(row)
+        self._update(paper, lambda record: record.remove(row, paper) if row in record.papers else None)
+
+    def get(self, name):
+        return self.authors.get(author_key(name))
+
+    def resolve(self, name):
+        """(author key, match type, score) for the best match of a typed name, or None"""
+        key = author_key(name)
+        if key in self.authors:
+            return key, 'exact', 1.0
+        return self.names.resolve(name)
+
+    def typeahead(self, text, limit=10):
+        return self.names.typeahead(text, limit)
+
+    def percentile(self, record):
+        """Share of authors with fewer total citations"""
+        below = bisect_left(self._all_citations, record.total_citations)
+        return round(100 * below / len(self._all_citations)) if self._all_citations else 0
+
+    def profile(self, name, store):
+        """Impact profile for an author, or None if they have no papers"""
+        key = author_key(name)
+        record = self.authors.get(key)
+        if record is None:
+            return None
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = self._build_profile(key, record, store)
+        # Percentiles move whenever any author changes, so they are never memoized
+        return {**profile, 'impact_percentile': self.percentile(record)}
+
+    def _build_profile(self, key, record, store):
+        years = sorted(record.publications_by_year)
+        publications = len(record.papers)
+        top_rows = heapq.nlargest(self.top_papers, record.papers.items(),
+                                  key=lambda item: (item[1], -item[0]))
+        top_papers = []
+        for row, citations in top_rows:
+            paper = store.row(row)
+            top_papers.append({'id': paper['id'], 'title': paper['title'],
+                               'year': paper['year'], 'citations': citations})
+        expertise = [keyword for keyword, _ in record.keywords.most_common(self.expertise_areas)]
+        metadata = self.metadata.get(key) or Author(key)
+
+        return {
+            'name': record.name,
+            'h_index': record.h_index,
+            'i10_index': record.i10_index,
+            'total_publications': publications,
+            'total_citations': record.total_citations,
+            'average_citations_per_paper': round(record.total_citations / publications, 1),
+            'field': metadata.field or (expertise[0] if expertise else None),
+            'institution': metadata.institution,
+            'years_active': years[-1] - years[0] + 1,
+            'publication_trend': {str(year): record.publications_by_year[year] for year in years},
+            # Citations received by the papers published in each year
+            'citations_trend': {str(year): record.citations_by_year[year] for year in years},
+            'top_papers': top_papers,
+            'expertise_areas': expertise,
+        }
+
+    def stats(self):
+        return {'authors': len(self.authors), 'canonical_names': len(self.names)}
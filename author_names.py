@@ -0,0 +1,281 @@
+"""
+BIOLIT INTELLIGENCE - AUTHOR NAME INDEX (author_names.py)
+Normalized author-name lookup: prefix autocomplete and fuzzy matching.
+
+Names are reduced to a canonical "surname initials" form, so "Smith, J.",
+"John Smith", "J. Smith" and "smith j" all map to "smith j".
+
+Prefix search is a burst trie. Canonical names are kept sorted, which puts
+every trie node's completions in one contiguous range found by bisection.
+Only the upper nodes, those with more than `bucket_size` completions, are
+materialized. Each stores its best candidates by citation weight. Below
+them a query ranks its (small) range directly, so answering costs a couple
+of binary searches and at most `bucket_size` weight comparisons.
+
+Fuzzy matching uses trigram postings. Candidates are generated from the
+query's rarest trigrams, then the best few are rescored with trigram
+Jaccard similarity.
+
+Names added after the last build sit in a small sorted side list that is
+merged in once it grows past a fraction of the main list.
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+NAME_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Candidates kept per materialized trie node, re-ranked by current weights
+NODE_CANDIDATES = 64
+# Posting entries scanned per fuzzy query, and candidates rescored exactly
+MAX_FUZZY_POSTINGS = 50000
+FUZZY_RESCORE = 50
+MIN_FUZZY_SIMILARITY = 0.3
+
+
+def name_tokens(name):
+    """Lowercase ASCII word tokens of a name, accents stripped"""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return NAME_TOKEN_RE.findall(ascii_name.lower())
+
+
+def normalize_query(text):
+    return ' '.join(name_tokens(text))
+
+
+def canonical_name(name):
+    """'Smith, J.', 'John Smith', 'J. Smith' and 'smith j' all become 'smith j'"""
+    if ',' in name:
+        surname, _, given = name.partition(',')
+        surname_tokens, given_tokens = name_tokens(surname), name_tokens(given)
+    else:
+        tokens = name_tokens(name)
+        if len(tokens) < 2:
+            return ' '.join(tokens)
+        if len(tokens[0]) > 1 and all(len(token) == 1 for token in tokens[1:]):
+            # Already surname-first, e.g. "smith j a"
+            surname_tokens, given_tokens = tokens[:1], tokens[1:]
+        else:
+            surname_tokens, given_tokens = tokens[-1:], tokens[:-1]
+    initials = ''.join(token[0] for token in given_tokens)
+    return ' '.join(surname_tokens + ([initials] if initials else []))
+
+
+def name_forms(name):
+    """Canonical readings of a typed name: as given, then surname-first ("Patel Sanjay")"""
+    forms = [canonical_name(name)]
+    tokens = name_tokens(name)
+    if ',' not in name and len(tokens) > 1:
+        surname_first = ' '.join([tokens[0], ''.join(token[0] for token in tokens[1:])])
+        if surname_first not in forms:
+            forms.append(surname_first)
+    return forms
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AuthorNameIndex:
+    """Canonical author names with prefix (burst trie) and trigram lookup"""
+
+    def __init__(self, bucket_size=512):
+        self.bucket_size = bucket_size
+        self.canonical = []        # id -> canonical name
+        self.ids = {}              # canonical name -> id
+        self.variants = []         # id -> {display name: weight}
+        self.weights = []          # id -> summed weight of live variants
+        self.postings = {}         # trigram -> array of ids
+        # Sorted canonical names and their ids; nodes maps heavy prefixes to candidates
+        self._sorted = ([], [], {})
+        self._pending = ([], [])
+        self._lock = threading.RLock()
+
+    # ---------- maintenance ----------
+
+    def set_weight(self, display_name, weight):
+        """Add a display name or update its weight (e.g. total citations)"""
+        with self._lock:
+            self._set_weight(display_name, weight, pending=True)
+
+    def set_weights(self, items):
+        """Bulk set_weight for (display name, weight) pairs, then one rebuild"""
+        with self._lock:
+            for display_name, weight in items:
+                self._set_weight(display_name, weight, pending=False)
+            self.build()
+
+    def _set_weight(self, display_name, weight, pending):
+        key = canonical_name(display_name)
+        if not key:
+            return
+        name_id = self.ids.get(key)
+        if name_id is None:
+            name_id = self.ids[key] = len(self.canonical)
+            self.canonical.append(key)
+            self.variants.append({})
+            self.weights.append(0.0)
+            for gram in trigrams(key):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('I')
+                posting.append(name_id)
+            if pending:
+                pending_names, pending_ids = self._pending
+                position = bisect_left(pending_names, key)
+                pending_names.insert(position, key)
+                pending_ids.insert(position, name_id)
+                if len(pending_names) > max(4096, len(self._sorted[0]) // 4):
+                    self.build()
+
+        variants = self.variants[name_id]
+        self.weights[name_id] += weight - variants.get(display_name, 0)
+        variants[display_name] = weight
+
+    def discard(self, display_name):
+        """Hide a display name that no longer has any papers"""
+        with self._lock:
+            name_id = self.ids.get(canonical_name(display_name))
+            if name_id is not None and display_name in self.variants[name_id]:
+                self.weights[name_id] -= self.variants[name_id].pop(display_name)
+
+    def build(self):
+        """Merge pending names into the sorted list and rebuild the trie nodes"""
+        with self._lock:
+            order = sorted(range(len(self.canonical)), key=self.canonical.__getitem__)
+            names = [self.canonical[name_id] for name_id in order]
+            # Hidden names rank below every live one
+            weights = np.array([weight if variants else -1.0
+                                for weight, variants in zip(self.weights, self.variants)])
+            nodes = {}
+            self._split(names, np.array(order, dtype=np.int64), weights, '', 0, len(names), nodes)
+            self._sorted = (names, order, nodes)
+            self._pending = ([], [])
+
+    def _split(self, names, order, weights, prefix, lo, hi, nodes):
+        """Materialize every prefix with more than bucket_size completions"""
+        if hi - lo <= self.bucket_size:
+            return
+        ids = order[lo:hi]
+        count = min(NODE_CANDIDATES, len(ids))
+        best = np.argpartition(-weights[ids], count - 1)[:count]
+        nodes[prefix] = ids[best].tolist()
+        depth = len(prefix)
+        while lo < hi and len(names[lo]) == depth:
+            lo += 1
+        while lo < hi:
+            child = prefix + names[lo][depth]
+            child_hi = bisect_left(names, child + '\x7f', lo, hi)
+            self._split(names, order, weights, child, lo, child_hi, nodes)
+            lo = child_hi
+
+    def _top(self, ids, limit):
+        weights, variants = self.weights, self.variants
+        return heapq.nlargest(limit, (name_id for name_id in ids if variants[name_id]),
+                              key=lambda name_id: (weights[name_id], -name_id))
+
+    # ---------- queries ----------
+
+    def prefix(self, text, limit=10):
+        """Ids of the heaviest canonical names starting with `text`"""
+        query = normalize_query(text)
+        names, order, nodes = self._sorted
+        pending_names, pending_ids = self._pending
+        lo = bisect_left(names, query)
+        hi = bisect_left(names, query + '\x7f', lo)
+        if hi - lo > self.bucket_size:
+            candidates = list(nodes.get(query, order[lo:lo + self.bucket_size]))
+        else:
+            candidates = order[lo:hi]
+        p_lo = bisect_left(pending_names, query)
+        p_hi = bisect_left(pending_names, query + '\x7f', p_lo)
+        return self._top(list(candidates) + pending_ids[p_lo:p_hi], limit)
+
+    def fuzzy(self, text, limit=10):
+        """(id, similarity) pairs for names sharing the most trigrams with `text`"""
+        best = {}
+        for form in name_forms(text):
+            for name_id, similarity in self._fuzzy_form(form):
+                best[name_id] = max(similarity, best.get(name_id, 0.0))
+        scored = sorted(best.items(), key=lambda item: (-item[1], -self.weights[item[0]], item[0]))
+        return scored[:limit]
+
+    def _fuzzy_form(self, query):
+        query_grams = trigrams(query)
+        postings = sorted((self.postings[gram] for gram in query_grams if gram in self.postings), key=len)
+        if not postings:
+            return []
+
+        # Candidates come from the rarest trigrams, within a fixed scan budget
+        chosen, scanned = [], 0
+        for posting in postings:
+            if chosen and scanned + len(posting) > MAX_FUZZY_POSTINGS:
+                break
+            chosen.append(np.array(posting[:MAX_FUZZY_POSTINGS], dtype=np.uint32))
+            scanned += len(chosen[-1])
+        ids, counts = np.unique(np.concatenate(chosen), return_counts=True)
+        if len(ids) > FUZZY_RESCORE:
+            keep = np.argpartition(-counts, FUZZY_RESCORE)[:FUZZY_RESCORE]
+            ids = ids[keep]
+
+        scored = []
+        for name_id in ids.tolist():
+            if not self.variants[name_id]:
+                continue
+            grams = trigrams(self.canonical[name_id])
+            similarity = len(grams & query_grams) / len(grams | query_grams)
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                scored.append((name_id, similarity))
+        return scored
+
+    def best_variant(self, name_id):
+        """Display name with the highest weight for a canonical id"""
+        variants = self.variants[name_id]
+        return max(variants, key=lambda name: (variants[name], name)) if variants else None
+
+    def resolve(self, text):
+        """(display name, match type, score) for the best match, or None"""
+        for form in name_forms(text):
+            name_id = self.ids.get(form)
+            if name_id is not None and self.variants[name_id]:
+                return self.best_variant(name_id), 'normalized', 1.0
+        matches = self.fuzzy(text, limit=1)
+        if matches:
+            name_id, similarity = matches[0]
+            return self.best_variant(name_id), 'fuzzy', round(similarity, 3)
+        return None
+
+    def typeahead(self, text, limit=10):
+        """Prefix completions, topped up with fuzzy matches"""
+        suggestions = [(name_id, 'prefix', 1.0) for name_id in self.prefix(text, limit)]
+        if len(suggestions) < limit:
+            # Also try the canonical form of a full name ("john smith" -> "smith j")
+            seen = {name_id for name_id, _, _ in suggestions}
+            canonical = canonical_name(text)
+            if canonical != normalize_query(text):
+                for name_id in self.prefix(canonical, limit):
+                    if name_id not in seen and len(suggestions) < limit:
+                        suggestions.append((name_id, 'prefix', 1.0))
+                        seen.add(name_id)
+            for name_id, similarity in self.fuzzy(text, limit):
+                if name_id not in seen and len(suggestions) < limit:
+                    suggestions.append((name_id, 'fuzzy', round(similarity, 3)))
+                    seen.add(name_id)
+        return [{
+            'name': self.best_variant(name_id),
+            'canonical': self.canonical[name_id],
+            'variants': sorted(self.variants[name_id]),
+            'weight': self.weights[name_id],
+            'match': match,
+            'score': score,
+        } for name_id, match, score in suggestions]
+
+    def __len__(self):
+        return len(self.canonical)
@@ -0,0 +1,90 @@
+"""
+Benchmark: in-process latency of the search, recommendation, citation-network and author-impact routes.
+
+Each workload is replayed through the Flask test client, one request at a
+time, so the numbers are handler cost without HTTP or worker scheduling.
+The response cache is off unless --cache is given, otherwise repeated
+requests would measure cache hits. The same requests are replayed --runs
+times and the median run is reported (see workload.py).
+
+    python benchmarks/corpus.py --papers 10k --store data/bench_10k
+    python benchmarks/bench_api.py --store data/bench_10k --save benchmarks/baselines/api_10k.json
+    python benchmarks/bench_api.py --store data/bench_10k --baseline benchmarks/baselines/api_10k.json
+
+With --baseline the exit status is 1 if any workload regressed beyond
+--tolerance and the run-to-run spread (advisory on a different CPU count).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workload import MIX, Workload, compare, median_summary, print_table, sample_papers, save, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--store', help='Paper store directory (default: the built-in corpus)')
+    parser.add_argument('--requests', type=int, default=500, help='Measured requests per workload')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=5, help='Repetitions; the median is reported')
+    parser.add_argument('--workloads', default=','.join(MIX))
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against a saved results file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    # Configuration is read when app is imported
+    if args.store:
+        os.environ['PAPER_STORE_DIR'] = args.store
+    os.environ.setdefault('RECOMMENDATION_PRECOMPUTE', '0')
+    if not args.cache:
+        os.environ['RESPONSE_CACHE_MAX_ENTRIES'] = '0'
+    started = time.perf_counter()
+    import app
+    startup = time.perf_counter() - started
+    client = app.app.test_client()
+    total = len(app.PAPER_STORE)
+    print(f"Loaded {total:,} papers in {startup:.1f}s")
+
+    workload = Workload(sample_papers(lambda path: client.get(path).get_json(), total), args.seed)
+    plans = {name: [workload.request(name) for _ in range(args.warmup + args.requests)]
+             for name in args.workloads.split(',')}
+    runs = []
+    for _ in range(max(1, args.runs)):
+        run = {}
+        for name, requests in plans.items():
+            latencies, errors = [], 0
+            measured = 0.0
+            for i, (method, path, body) in enumerate(requests):
+                begin = time.perf_counter()
+                response = client.open(path, method=method, json=body)
+                elapsed = time.perf_counter() - begin
+                if i < args.warmup:
+                    continue
+                measured += elapsed
+                # 404s are unresolvable sampled inputs, not failures
+                if response.status_code >= 500:
+                    errors += 1
+                latencies.append(elapsed * 1000)
+            run[name] = summarize(latencies, measured, errors)
+        runs.append(run)
+    results = median_summary(runs)
+
+    print_table(results)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        save(args.save, results, {'label': os.path.basename(args.save), 'papers': total,
+                                  'requests': args.requests, 'runs': len(runs), 'cache': args.cache,
+                                  'seed': args.seed, 'cpus': os.cpu_count()})
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
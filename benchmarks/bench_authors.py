@@ -0,0 +1,77 @@
+"""
+Benchmark: author typeahead latency over synthetic author names.
+
+Builds an AuthorNameIndex of random "Surname, I." names and times prefix
+and fuzzy lookups; the target is a p99 under 5 ms at millions of names.
+
+    python benchmarks/bench_authors.py --names 2000000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from author_names import AuthorNameIndex
+
+SYLLABLES = ['an', 'ber', 'chen', 'da', 'el', 'fa', 'gar', 'ha', 'in', 'jo', 'ka', 'li', 'mar',
+             'no', 'or', 'pa', 'qu', 'ro', 'sa', 'son', 'ta', 'u', 'vi', 'wa', 'xi', 'ya', 'zu']
+
+
+def make_name(rng):
+    surname = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))).capitalize()
+    initials = ' '.join(f'{c}.' for c in rng.sample(string.ascii_uppercase, rng.randint(1, 2)))
+    return f'{surname}, {initials}'
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def time_queries(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--names', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = [make_name(rng) for _ in range(args.names)]
+
+    started = time.perf_counter()
+    index = AuthorNameIndex()
+    index.set_weights((name, rng.randint(0, 5000)) for name in names)
+    print(f"indexed {len(index):,} canonical names in {time.perf_counter() - started:.1f}s")
+
+    sample = rng.sample(names, args.queries)
+    prefixes = [name[:rng.randint(1, 6)] for name in sample]
+    typos = []
+    for name in sample:
+        position = rng.randrange(len(name.split(',')[0]))
+        typos.append(name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:])
+
+    print(f"{'lookup':>10}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for label, fn, queries in (('prefix', index.prefix, prefixes),
+                               ('fuzzy', index.fuzzy, typos),
+                               ('typeahead', index.typeahead, prefixes)):
+        samples = time_queries(fn, queries)
+        print(f"{label:>10}  {percentile(samples, 50):>8.3f}  {percentile(samples, 95):>8.3f}  "
+              f"{percentile(samples, 99):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: LLM client throughput against the local mock server.
+
+Starts mock_llm_server.py in-process with an injected latency and fans out
+batches of completions at several concurrency limits.
+
+    python benchmarks/bench_llm.py --requests 64 --latency-ms 100
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_client import AsyncLLMClient
+from mock_llm_server import start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    prompts = [f'Summarize paper {i}' for i in range(args.requests)]
+
+    print(f"{'concurrency':>11}  {'seconds':>8}  {'req/s':>8}  {'failed':>6}  {'retries':>7}")
+    for concurrency in args.concurrency:
+        client = AsyncLLMClient('test', base_url=base_url, max_concurrency=concurrency,
+                                timeout=60, backoff=0.05)
+        started = time.perf_counter()
+        results = client.complete_many(prompts, timeout=600)
+        elapsed = time.perf_counter() - started
+        failed = sum(isinstance(r, Exception) for r in results)
+        print(f"{concurrency:>11}  {elapsed:>8.2f}  {args.requests / elapsed:>8.1f}  "
+              f"{failed:>6}  {client.retries:>7}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Micro-benchmark: paper lookup by id through the store's IdIndex.
+
+Lookup cost should stay flat as the corpus grows.
+
+    python benchmarks/bench_lookup.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_store import MemoryPaperStore
+
+
+def make_papers(count):
+    return [{'id': i + 1, 'title': f'Paper {i + 1}'} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'papers':>10}  {'ns/lookup':>10}")
+    for size in args.sizes:
+        store = MemoryPaperStore(make_papers(size))
+        ids = [random.randint(1, size) for _ in range(args.lookups)]
+        seconds = timeit.timeit(lambda: [store.get(paper_id) for paper_id in ids], number=1)
+        print(f"{size:>10}  {seconds / args.lookups * 1e9:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
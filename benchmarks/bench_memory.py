@@ -0,0 +1,87 @@
+"""
+Benchmark: bytes per paper held in memory, plain dicts vs compact records.
+
+Synthetic papers are decoded from JSON lines (as ingestion does, so every
+record owns its strings), then held either as a list of dicts (the old
+MemoryPaperStore) or in the columnar MemoryPaperStore with interned Paper
+records. Memory is measured with tracemalloc.
+
+    python benchmarks/bench_memory.py --papers 1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_store import IdIndex, MemoryPaperStore
+
+WORDS = ['gene', 'cell', 'protein', 'cancer', 'immune', 'therapy', 'sequencing', 'editing', 'tumor',
+         'vaccine', 'neural', 'genome', 'expression', 'pathway', 'receptor', 'signaling', 'clinical']
+JOURNALS = [f'Journal of {a.title()} {b.title()}' for a in WORDS for b in WORDS[:12]]
+KEYWORDS = [f'{a} {b}' for a in WORDS for b in WORDS] + WORDS
+
+
+def paper_lines(count, seed):
+    """JSON lines of synthetic papers shaped like the corpus"""
+    rng = random.Random(seed)
+    surnames = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9))).title()
+                for _ in range(max(1000, count // 3))]
+    for paper_id in range(1, count + 1):
+        yield json.dumps({
+            'id': paper_id,
+            'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))).capitalize(),
+            'authors': [f'{rng.choice(surnames)}, {rng.choice("ABCDEFGHJKLMNPRST")}.'
+                        for _ in range(rng.randint(2, 6))],
+            'year': rng.randint(1990, 2025),
+            'journal': rng.choice(JOURNALS),
+            'citations': int(rng.paretovariate(1.2)) * 3,
+            'impact_factor': round(rng.uniform(0.5, 40), 1),
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 40))),
+            'keywords': rng.sample(KEYWORDS, rng.randint(3, 8)),
+            'h_index': rng.randint(0, 120),
+            'references': [rng.randint(1, count) for _ in range(rng.randint(0, 12))],
+        })
+
+
+def dict_store(papers):
+    """The previous MemoryPaperStore layout: a list of dicts plus the id index"""
+    papers = list(papers)
+    return papers, IdIndex((paper['id'], row) for row, paper in enumerate(papers))
+
+
+def measure(build, lines):
+    """(bytes held by the built object, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build(json.loads(line) for line in lines)
+    seconds = time.perf_counter() - started
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    lines = list(paper_lines(args.papers, args.seed))
+    print(f"{'layout':>16}  {'bytes/paper':>12}  {'total MB':>10}  {'build s':>8}")
+    for label, build in (('dicts', dict_store), ('compact records', MemoryPaperStore)):
+        size, seconds = measure(build, lines)
+        print(f"{label:>16}  {size / args.papers:>12,.0f}  {size / 2 ** 20:>10,.1f}  {seconds:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: semantic search recall and latency against nprobe.
+
+Builds a SemanticIndex over synthetic papers drawn from topic vocabularies,
+then compares IVF results for each nprobe with an exact (all lists) search.
+
+    python benchmarks/bench_semantic.py --papers 200000 --nlist 512 --nprobe 1 4 8 16 32
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_store import MemoryPaperStore
+from semantic_index import SemanticIndex
+
+
+def make_papers(count, topics, rng):
+    vocabularies = [[f't{topic}w{word}' for word in range(60)] for topic in range(topics)]
+    shared = [f'common{word}' for word in range(300)]
+    papers = []
+    for paper_id in range(1, count + 1):
+        vocabulary = vocabularies[rng.randrange(topics)]
+        words = rng.choices(vocabulary, k=12) + rng.choices(shared, k=20)
+        papers.append({'id': paper_id, 'title': ' '.join(words[:8]), 'abstract': ' '.join(words[8:])})
+    return papers
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=100_000)
+    parser.add_argument('--topics', type=int, default=200)
+    parser.add_argument('--nlist', type=int, default=None)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    store = MemoryPaperStore(make_papers(args.papers, args.topics, rng))
+    started = time.perf_counter()
+    index = SemanticIndex.build(store, nlist=args.nlist)
+    print(f"indexed {len(index):,} papers into {len(index.centroids)} lists in "
+          f"{time.perf_counter() - started:.1f}s")
+
+    queries = [' '.join(store.row(rng.randrange(len(store)))['title'].split()[:4]) for _ in range(args.queries)]
+    exact = [set(index.search(query, args.k, nprobe=len(index.centroids))) for query in queries]
+
+    print(f"{'nprobe':>7}  {'recall@' + str(args.k):>10}  {'p50 ms':>8}  {'p99 ms':>8}")
+    for nprobe in args.nprobe:
+        samples, hits = [], 0
+        for query, truth in zip(queries, exact):
+            started = time.perf_counter()
+            found = index.search(query, args.k, nprobe=nprobe)
+            samples.append((time.perf_counter() - started) * 1000)
+            hits += len(truth & set(found))
+        recall = hits / max(1, sum(map(len, exact)))
+        print(f"{nprobe:>7}  {recall:>10.3f}  {percentile(samples, 50):>8.2f}  {percentile(samples, 99):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
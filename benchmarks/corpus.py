@@ -0,0 +1,187 @@
+"""
+Synthetic corpus generator in the PAPERS_DB schema.
+
+Papers are reproducible from a seed and written as NDJSON, streamed in
+chunks, so 10M papers never sit in memory. Distributions follow the shapes
+of real bibliographic data:
+- keywords, journals and abstract words are Zipf-distributed over fixed
+  vocabularies
+- author productivity is Zipf-distributed
+- publication volume grows year over year
+- citations are heavy-tailed and grow with age
+- references point at earlier papers, biased towards highly cited ones
+
+    python benchmarks/corpus.py --papers 1000000 --out data/bench_1m.ndjson.gz
+    python ingest.py data/bench_1m.ndjson.gz --store data/bench_1m
+
+or build the paper store directly with --store.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+CHUNK = 50_000
+SYLLABLES = ['al', 'bi', 'cor', 'da', 'en', 'fi', 'gen', 'hy', 'im', 'ki', 'lo', 'mi', 'neu', 'o', 'path',
+             'pro', 'qui', 'ra', 'si', 'to', 'u', 'vas', 'xe', 'zy', 'tein', 'cyte', 'ase', 'ome', 'lin', 'gly']
+SURNAME_SYLLABLES = ['an', 'ber', 'chen', 'da', 'el', 'fer', 'gar', 'ha', 'ito', 'jo', 'ka', 'li', 'mar',
+                     'no', 'or', 'pa', 'ro', 'sa', 'son', 'ta', 'van', 'wa', 'xu', 'ya', 'zhang']
+INITIALS = list('ABCDEFGHJKLMNPRSTW')
+JOURNAL_SUFFIXES = ['Research', 'Letters', 'Reports', 'Reviews', 'Journal', 'Medicine', 'Biology', 'Science']
+FIRST_YEAR, LAST_YEAR = 1990, 2025
+
+
+def make_words(rng, count, syllables, low, high):
+    """`count` distinct pseudo-words of low..high syllables, in random order"""
+    words = {}
+    while len(words) < count:
+        lengths = rng.integers(low, high + 1, count)
+        parts = rng.integers(0, len(syllables), (count, high))
+        for length, row in zip(lengths, parts):
+            words.setdefault(''.join(syllables[i] for i in row[:length]), None)
+    return list(words)[:count]
+
+
+class ZipfSampler:
+    """Ranks 0..size-1 drawn with Zipf-Mandelbrot weights 1 / (rank + offset) ** exponent"""
+
+    def __init__(self, size, exponent=1.0, offset=2.7):
+        weights = 1.0 / (np.arange(size) + offset) ** exponent
+        self.cdf = np.cumsum(weights / weights.sum())
+
+    def __call__(self, rng, count):
+        return np.minimum(np.searchsorted(self.cdf, rng.random(count)), len(self.cdf) - 1)
+
+
+def split(values, counts):
+    """Consecutive slices of values with the given lengths"""
+    return np.split(values, np.cumsum(counts)[:-1])
+
+
+class CorpusGenerator:
+    """Reproducible synthetic papers, generated chunk by chunk"""
+
+    def __init__(self, papers, seed=7):
+        self.papers = papers
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+        self.words = np.array(make_words(rng, 20_000, SYLLABLES, 2, 4), dtype=object)
+        self.keywords = np.array(list(dict.fromkeys(
+            ' '.join(pair[:rng.integers(1, 3)]) for pair in rng.choice(self.words[:5_000], (30_000, 2)))),
+            dtype=object)
+        self.journals = np.array([f"{name.title()} {rng.choice(JOURNAL_SUFFIXES)}"
+                                  for name in make_words(rng, 2_000, SYLLABLES, 2, 3)], dtype=object)
+        # Distinct (surname, initials) combinations, so author count scales with the corpus
+        surnames = make_words(rng, 20_000, SURNAME_SYLLABLES, 1, 4)
+        author_count = max(1_000, papers // 3)
+        combos = rng.choice(len(surnames) * len(INITIALS) * (len(INITIALS) + 1), author_count, replace=False)
+        names = []
+        for combo in combos.tolist():
+            combo, second = divmod(combo, len(INITIALS) + 1)
+            surname, first = divmod(combo, len(INITIALS))
+            middle = f' {INITIALS[second - 1]}.' if second else ''
+            names.append(f'{surnames[surname].title()}, {INITIALS[first]}.{middle}')
+        self.authors = np.array(names, dtype=object)
+        self.sample_keyword = ZipfSampler(len(self.keywords), 1.0, offset=10)
+        self.sample_word = ZipfSampler(len(self.words), 1.0, offset=10)
+        self.sample_journal = ZipfSampler(len(self.journals), 1.1)
+        self.sample_author = ZipfSampler(len(self.authors), 0.9, offset=100)
+        # Paper volume grows ~6% a year
+        years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+        weights = 1.06 ** (years - FIRST_YEAR)
+        self.years = years
+        self.year_weights = weights / weights.sum()
+
+    def chunks(self):
+        """Yield lists of paper dicts, ids 1..papers in order"""
+        rng = self.rng
+        for start in range(0, self.papers, CHUNK):
+            count = min(CHUNK, self.papers - start)
+            ids = np.arange(start + 1, start + count + 1)
+            years = np.sort(rng.choice(self.years, count, p=self.year_weights))
+            age = LAST_YEAR - years + 1
+            citations = (rng.pareto(1.3, count) * 4 * np.sqrt(age)).astype(np.int64)
+            impact = np.round(rng.lognormal(1.3, 0.7, count), 1)
+            journals = self.journals[self.sample_journal(rng, count)]
+
+            keyword_counts = rng.integers(3, 9, count)
+            keywords = split(self.keywords[self.sample_keyword(rng, int(keyword_counts.sum()))], keyword_counts)
+            author_counts = np.minimum(rng.geometric(0.25, count), 20)
+            authors = split(self.authors[self.sample_author(rng, int(author_counts.sum()))], author_counts)
+            word_counts = rng.integers(60, 160, count)
+            abstracts = split(self.words[self.sample_word(rng, int(word_counts.sum()))], word_counts)
+            title_counts = rng.integers(5, 12, count)
+            # References point at earlier papers, skewed towards low ids (older, more cited)
+            reference_counts = np.where(ids > 1, rng.integers(0, 30, count), 0)
+            earlier = np.repeat(ids - 1, reference_counts)
+            references = split(
+                (earlier * rng.power(0.6, int(reference_counts.sum()))).astype(np.int64) + 1, reference_counts)
+
+            papers = []
+            for i in range(count):
+                paper_keywords = list(dict.fromkeys(keywords[i].tolist()))
+                abstract = abstracts[i].tolist()
+                papers.append({
+                    'id': int(ids[i]),
+                    'title': ' '.join([paper_keywords[0].title()] + abstract[:title_counts[i]]).capitalize(),
+                    'authors': list(dict.fromkeys(authors[i].tolist())),
+                    'year': int(years[i]),
+                    'journal': journals[i],
+                    'citations': int(citations[i]),
+                    'impact_factor': float(impact[i]),
+                    'abstract': ' '.join(abstract),
+                    'keywords': paper_keywords,
+                    'h_index': int(min(200, np.sqrt(citations[i]) * 2)),
+                    'references': np.unique(references[i]).tolist(),
+                })
+            yield papers
+
+
+def write_ndjson(generator, path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for papers in generator.chunks():
+            f.writelines(json.dumps(paper, separators=(',', ':')) + '\n' for paper in papers)
+            yield len(papers)
+
+
+def write_store(generator, directory):
+    from paper_store import MmapPaperStore
+    store = MmapPaperStore.create(directory)
+    for papers in generator.chunks():
+        store.append(papers)
+        yield len(papers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', default='10k', help=f"paper count or one of {', '.join(SIZES)}")
+    parser.add_argument('--out', help='NDJSON output path (.gz to compress)')
+    parser.add_argument('--store', help='Build a paper store directory instead')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    if not args.out and not args.store:
+        parser.error('give --out or --store')
+
+    papers = SIZES.get(args.papers.lower()) or int(args.papers)
+    started = time.perf_counter()
+    generator = CorpusGenerator(papers, args.seed)
+    written = 0
+    progress = write_store(generator, args.store) if args.store else write_ndjson(generator, args.out)
+    for count in progress:
+        written += count
+        elapsed = time.perf_counter() - started
+        print(f"  {written:,} papers ({written / elapsed:,.0f}/s)")
+    print(f"Wrote {written:,} papers to {args.store or args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
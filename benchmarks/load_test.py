@@ -0,0 +1,187 @@
+"""
+Load test: closed-loop HTTP clients against the app served by gunicorn.
+
+Starts `gunicorn app:app` on a local port with the given store and worker
+count (or targets --url), samples papers from it, then runs --clients
+client processes for --duration seconds. Each client replays its own slice
+of the mixed workload in workload.py over one keep-alive connection, sending
+the next request as soon as the previous one is answered.
+
+Throughput and p50/p95/p99 latency are reported per workload and overall,
+as seen by the client (network and queueing included). A warm-up period is
+excluded from the numbers. The measurement is repeated --runs times against
+the same server and the median run is reported (see workload.py).
+
+    python benchmarks/load_test.py --store data/bench_1m --workers 4 --clients 16 --duration 60 \\
+        --save benchmarks/baselines/load_1m.json
+    python benchmarks/load_test.py --store data/bench_1m --baseline benchmarks/baselines/load_1m.json
+
+With --baseline the exit status is 1 if any workload regressed beyond
+--tolerance and the run-to-run spread (advisory on a different CPU count).
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workload import Workload, compare, median_summary, print_table, sample_papers, save, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT = 600
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def get_json(url, path, timeout=30):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def start_server(args, port):
+    """Launch gunicorn and wait until /api/health answers"""
+    env = dict(os.environ, RECOMMENDATION_PRECOMPUTE=os.getenv('RECOMMENDATION_PRECOMPUTE', '0'))
+    if args.store:
+        env['PAPER_STORE_DIR'] = args.store
+    if not args.cache:
+        env['RESPONSE_CACHE_MAX_ENTRIES'] = '0'
+    command = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '-b', f'127.0.0.1:{port}',
+               '--timeout', '120', '--log-level', 'warning', 'app:app']
+    server = subprocess.Popen(command, cwd=ROOT, env=env)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {server.returncode}')
+        try:
+            get_json(url, '/api/health', timeout=1)
+            return server, url
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError('gunicorn did not become healthy in time')
+
+
+def run_client(url, requests, started, warmup_until, stop_at, queue):
+    """Send requests back to back until stop_at; report (name, latency ms, error) after warm-up"""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    headers = {'Content-Type': 'application/json'}
+    samples = []
+    while time.time() < started:
+        time.sleep(0.01)
+    i = 0
+    while time.time() < stop_at:
+        name, method, path, body = requests[i % len(requests)]
+        i += 1
+        begin = time.perf_counter()
+        try:
+            connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = connection.getresponse()
+            response.read()
+            error = response.status >= 500
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            error = True
+        elapsed_ms = (time.perf_counter() - begin) * 1000
+        if time.time() >= warmup_until:
+            samples.append((name, elapsed_ms, error))
+    connection.close()
+    queue.put(samples)
+
+
+def measure(url, plans, args):
+    """One closed-loop run of every client plan; returns {workload: summary} plus 'all'"""
+    queue = multiprocessing.Queue()
+    started = time.time() + 1
+    warmup_until = started + args.warmup
+    stop_at = warmup_until + args.duration
+    clients = [multiprocessing.Process(target=run_client,
+                                       args=(url, plan, started, warmup_until, stop_at, queue))
+               for plan in plans]
+    for client in clients:
+        client.start()
+    samples = [sample for _ in clients for sample in queue.get()]
+    for client in clients:
+        client.join()
+
+    latencies, errors = defaultdict(list), defaultdict(int)
+    for name, elapsed_ms, error in samples:
+        latencies[name].append(elapsed_ms)
+        errors[name] += error
+    results = {name: summarize(latencies[name], args.duration, errors[name]) for name in sorted(latencies)}
+    results['all'] = summarize([s[1] for s in samples], args.duration, sum(errors.values()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--store', help='Paper store directory (default: the built-in corpus)')
+    parser.add_argument('--url', help='Target a running server instead of starting gunicorn')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='gunicorn workers')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent client processes')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Seconds excluded from the numbers')
+    parser.add_argument('--runs', type=int, default=3, help='Repetitions; the median is reported')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against a saved results file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = args.url.rstrip('/')
+    else:
+        print(f"Starting gunicorn with {args.workers} workers...")
+        server, url = start_server(args, free_port())
+    try:
+        total = get_json(url, '/api/health')['papers']
+        workload = Workload(sample_papers(lambda path: get_json(url, path), total), args.seed)
+        # Each client gets its own deterministic slice of the mix
+        plans = [workload.mixed(5000) for _ in range(args.clients)]
+
+        runs = max(1, args.runs)
+        print(f"{args.clients} clients against {url} ({total:,} papers): {runs} runs of "
+              f"{args.warmup:.0f}s warm-up, {args.duration:.0f}s measured")
+        runs = [measure(url, plans, args) for _ in range(runs)]
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    results = median_summary(runs)
+
+    print_table(results)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        save(args.save, results, {'label': os.path.basename(args.save), 'papers': total,
+                                  'workers': args.workers, 'clients': args.clients,
+                                  'duration': args.duration, 'runs': len(runs), 'cache': args.cache,
+                                  'seed': args.seed, 'cpus': os.cpu_count()})
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+Shared workload and reporting helpers for bench_api.py and load_test.py.
+
+Requests are drawn from a sample of real papers in the served corpus, so
+the same seed replays the same requests against any server or store:
+- search: keyword queries built from paper keywords, a third of them with
+  year/citation filters
+- search_semantic: the same queries answered by the semantic index
+- recommendations, citation_network: papers picked uniformly
+- author_impact: authors of sampled papers
+
+Results are {workload: summary} dicts saved as JSON. The runners repeat
+each measurement and keep the median of every figure along with its
+run-to-run spread, since a single run on a small or shared machine easily
+swings by more than the effect being looked for. compare() checks them
+against a stored baseline and flags p95 latency and throughput regressions
+beyond the larger of the tolerance and NOISE_FACTOR times the measured
+spread. Against a
+baseline recorded on a different CPU count the check is advisory only.
+"""
+
+import json
+import math
+import os
+import random
+import statistics
+import sys
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_export import encode_cursor
+
+# Relative share of each workload in the mixed load test
+MIX = {
+    'search': 40,
+    'search_semantic': 10,
+    'recommendations': 20,
+    'citation_network': 15,
+    'author_impact': 15,
+}
+SAMPLE_PAGES = 20
+# A change must exceed this many run-to-run spreads to count as a regression
+NOISE_FACTOR = 3
+SAMPLE_PAGE_SIZE = 50
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+def summarize(latencies_ms, seconds, errors=0):
+    """Throughput and latency percentiles of one workload"""
+    latencies_ms = sorted(latencies_ms)
+    return {
+        'requests': len(latencies_ms),
+        'errors': errors,
+        'throughput_rps': round(len(latencies_ms) / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(percentile(latencies_ms, 50), 3),
+        'p95_ms': round(percentile(latencies_ms, 95), 3),
+        'p99_ms': round(percentile(latencies_ms, 99), 3),
+    }
+
+
+def spread(values):
+    """Median absolute deviation of repeated measurements, relative to their median"""
+    middle = statistics.median(values)
+    if not middle:
+        return 0.0
+    return round(statistics.median(abs(value - middle) for value in values) / middle, 3)
+
+
+def median_summary(runs):
+    """Combine repeated runs ({workload: summary} each) into per-workload medians.
+
+    Requests and errors are totals over the runs; the p95 and throughput
+    spreads record how noisy the measurement was.
+    """
+    results = {}
+    for name in runs[0]:
+        samples = [run[name] for run in runs if name in run]
+        results[name] = {
+            'runs': len(samples),
+            'requests': sum(s['requests'] for s in samples),
+            'errors': sum(s['errors'] for s in samples),
+            'throughput_rps': round(statistics.median(s['throughput_rps'] for s in samples), 1),
+            'p50_ms': round(statistics.median(s['p50_ms'] for s in samples), 3),
+            'p95_ms': round(statistics.median(s['p95_ms'] for s in samples), 3),
+            'p99_ms': round(statistics.median(s['p99_ms'] for s in samples), 3),
+            'p95_spread': spread([s['p95_ms'] for s in samples]),
+            'throughput_spread': spread([s['throughput_rps'] for s in samples]),
+        }
+    return results
+
+
+def sample_papers(get_json, total):
+    """Sample papers spread over the corpus; get_json(path) returns the decoded body"""
+    step = max(1, total // SAMPLE_PAGES)
+    papers = []
+    for start in range(0, max(total, 1), step):
+        body = get_json(f'/api/papers?limit={SAMPLE_PAGE_SIZE}&fields=id,authors,keywords'
+                        f'&cursor={encode_cursor(start)}')
+        papers.extend(body.get('papers', []))
+    return [p for p in papers if p.get('id') is not None]
+
+
+class Workload:
+    """Deterministic request generator over a paper sample"""
+
+    def __init__(self, papers, seed=7):
+        if not papers:
+            raise ValueError('no papers to build a workload from')
+        self.rng = random.Random(seed)
+        self.ids = [p['id'] for p in papers]
+        self.keywords = sorted({k for p in papers for k in p.get('keywords') or []})
+        self.authors = sorted({a for p in papers for a in p.get('authors') or []})
+
+    def _query(self):
+        return ' '.join(self.rng.sample(self.keywords, min(len(self.keywords), self.rng.randint(1, 2))))
+
+    def request(self, name):
+        """(method, path, json body or None) for one request of workload `name`"""
+        rng = self.rng
+        if name == 'search':
+            body = {'query': self._query()}
+            if rng.random() < 1 / 3:
+                body.update(year_from=rng.randint(1995, 2020), min_citations=rng.choice([0, 5, 20]))
+            return 'POST', '/api/search', body
+        if name == 'search_semantic':
+            return 'POST', '/api/search', {'query': self._query(), 'mode': 'semantic'}
+        if name == 'recommendations':
+            return 'GET', f'/api/recommendations/{rng.choice(self.ids)}', None
+        if name == 'citation_network':
+            return 'GET', f'/api/citation-network/{rng.choice(self.ids)}?depth={rng.choice([1, 1, 2])}', None
+        if name == 'author_impact':
+            return 'GET', f"/api/author-impact/{quote(rng.choice(self.authors), safe='')}", None
+        raise ValueError(f'unknown workload {name}')
+
+    def mixed(self, count):
+        """`count` (workload, method, path, body) tuples drawn from MIX"""
+        names = self.rng.choices(list(MIX), weights=list(MIX.values()), k=count)
+        return [(name, *self.request(name)) for name in names]
+
+
+def print_table(results):
+    print(f"{'workload':>18}  {'requests':>8}  {'errors':>6}  {'req/s':>9}  "
+          f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:>18}  {r['requests']:>8}  {r['errors']:>6}  {r['throughput_rps']:>9,.1f}  "
+              f"{r['p50_ms']:>8.2f}  {r['p95_ms']:>8.2f}  {r['p99_ms']:>8.2f}")
+
+
+def save(path, results, meta):
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline_path, tolerance):
+    """Print the change against a saved run; return the regressed workloads.
+
+    A change counts only beyond the larger of `tolerance` and NOISE_FACTOR
+    times the run-to-run spread of either side. Nothing is returned (the comparison is printed
+    as advisory) when the baseline was recorded on a different CPU count.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    meta = baseline.get('meta', {})
+    print(f"\nAgainst {baseline_path} ({meta.get('label', 'baseline')}), "
+          f"tolerance {tolerance:.0%} or {NOISE_FACTOR}x the run-to-run spread if larger:")
+    print(f"{'workload':>18}  {'base req/s':>10}  {'req/s':>9}  {'change':>7}  "
+          f"{'base p95':>8}  {'p95 ms':>8}  {'change':>7}  {'allowed':>7}  verdict")
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:>18}  {'-':>10}  {r['throughput_rps']:>9,.1f}  {'-':>7}  "
+                  f"{'-':>8}  {r['p95_ms']:>8.2f}  {'-':>7}  {'-':>7}  new")
+            continue
+        rps_change = r['throughput_rps'] / base['throughput_rps'] - 1 if base['throughput_rps'] else 0.0
+        p95_change = r['p95_ms'] / base['p95_ms'] - 1 if base['p95_ms'] else 0.0
+        p95_allowed = max(tolerance, NOISE_FACTOR * max(base.get('p95_spread', 0.0), r.get('p95_spread', 0.0)))
+        rps_allowed = max(tolerance, NOISE_FACTOR * max(base.get('throughput_spread', 0.0),
+                                                        r.get('throughput_spread', 0.0)))
+        regressed = rps_change < -rps_allowed or p95_change > p95_allowed or r['errors'] > base['errors']
+        if regressed:
+            regressions.append(name)
+        print(f"{name:>18}  {base['throughput_rps']:>10,.1f}  {r['throughput_rps']:>9,.1f}  {rps_change:>+7.0%}  "
+              f"{base['p95_ms']:>8.2f}  {r['p95_ms']:>8.2f}  {p95_change:>+7.0%}  {p95_allowed:>7.0%}  "
+              f"{'REGRESSION' if regressed else 'ok'}")
+
+    if meta.get('cpus') != os.cpu_count():
+        print(f"\nBaseline was recorded on {meta.get('cpus')} CPUs, this machine has {os.cpu_count()}: "
+              f"advisory only. Re-record the baseline here to gate on it.")
+        return []
+    return regressions
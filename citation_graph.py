@@ -0,0 +1,196 @@
+"""
+BIOLIT INTELLIGENCE - CITATION GRAPH (citation_graph.py)
+Citation graph built from the `references` field of every paper.
+
+Edges are stored as compressed sparse row arrays in both directions
+(row -> papers it cites, row -> papers citing it), so neighbourhood
+expansion is a vectorized gather over index ranges instead of a walk over
+Python objects. Rows are positions in the paper store.
+"""
+
+import threading
+
+import numpy as np
+
+EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def gather(indptr, indices, rows):
+    """Concatenate the CSR slices of `rows` without a Python-level loop"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return EMPTY
+    group_starts = np.cumsum(lengths) - lengths
+    offsets = np.repeat(starts - group_starts, lengths) + np.arange(total)
+    return indices[offsets]
+
+
+def to_csr(sources, targets, row_count):
+    """CSR (indptr, indices) of the edges grouped by source row"""
+    order = np.argsort(sources, kind='stable')
+    counts = np.bincount(sources, minlength=row_count)
+    indptr = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+class CitationGraph:
+    """Directed citation graph with CSR adjacency for both directions"""
+
+    def __init__(self):
+        self.row_count = 0
+        self._sources = EMPTY
+        self._targets = EMPTY
+        self._pending = []
+        # Citations to ids that are not in the corpus yet: id -> citing rows
+        self._unresolved = {}
+        self.out_indptr = np.zeros(1, dtype=np.int64)
+        self.out_indices = EMPTY
+        self.in_indptr = np.zeros(1, dtype=np.int64)
+        self.in_indices = EMPTY
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_store(cls, store):
+        graph = cls()
+        graph.add_rows(store, range(len(store)))
+        return graph
+
+    @property
+    def edge_count(self):
+        with self._lock:
+            self._build()
+            return len(self.out_indices)
+
+    def add_rows(self, store, rows):
+        """Add papers stored at `rows`, resolving references through the store's id index"""
+        with self._lock:
+            for row in rows:
+                self.row_count = max(self.row_count, row + 1)
+                if not store.is_live(row):
+                    # Superseded by a later row with the same id
+                    continue
+                paper = store.row(row)
+                for cited_id in paper.get('references') or ():
+                    cited_row = store.row_of(cited_id)
+                    if cited_row is None:
+                        self._unresolved.setdefault(cited_id, []).append(row)
+                    else:
+                        self._pending.append((row, cited_row))
+                # Earlier papers that cited this one before it was ingested
+                for citing_row in self._unresolved.pop(paper['id'], ()):
+                    self._pending.append((citing_row, row))
+            self._dirty = True
+
+    def supersede(self, replacements):
+        """Apply a batch of superseded rows ({old_row: new_row}) in one pass.
+
+        Citations of each old row are pointed at its new row and the old
+        rows' own references are dropped; the CSR arrays are rebuilt once,
+        lazily, on the next query.
+        """
+        if not replacements:
+            return
+        old_rows = np.array(sorted(replacements), dtype=np.int32)
+        new_rows = np.array([replacements[row] for row in old_rows.tolist()], dtype=np.int32)
+        with self._lock:
+            self._merge_pending()
+            keep = ~np.isin(self._sources, old_rows)
+            sources, targets = self._sources[keep], self._targets[keep]
+            positions = np.searchsorted(old_rows, targets).clip(max=len(old_rows) - 1)
+            superseded = old_rows[positions] == targets
+            self._sources = sources
+            self._targets = np.where(superseded, new_rows[positions], targets).astype(np.int32)
+            old_set = set(old_rows.tolist())
+            for cited_id, citing_rows in self._unresolved.items():
+                if not old_set.isdisjoint(citing_rows):
+                    self._unresolved[cited_id] = [r for r in citing_rows if r not in old_set]
+            self._dirty = True
+
+    def _merge_pending(self):
+        # Callers hold self._lock
+        if self._pending:
+            pending = np.array(self._pending, dtype=np.int32).reshape(-1, 2)
+            self._sources = np.concatenate([self._sources, pending[:, 0]])
+            self._targets = np.concatenate([self._targets, pending[:, 1]])
+            self._pending = []
+
+    def _build(self):
+        # Callers hold self._lock
+        if not self._dirty:
+            return
+        self._merge_pending()
+        self.out_indptr, self.out_indices = to_csr(self._sources, self._targets, self.row_count)
+        self.in_indptr, self.in_indices = to_csr(self._targets, self._sources, self.row_count)
+        self._dirty = False
+
+    def _snapshot(self):
+        with self._lock:
+            self._build()
+            return self.out_indptr, self.out_indices, self.in_indptr, self.in_indices
+
+    def cites(self, row):
+        out_indptr, out_indices, _, _ = self._snapshot()
+        return out_indices[out_indptr[row]:out_indptr[row + 1]]
+
+    def cited_by(self, row):
+        _, _, in_indptr, in_indices = self._snapshot()
+        return in_indices[in_indptr[row]:in_indptr[row + 1]]
+
+    def neighborhood(self, row, depth=1, max_nodes=10000):
+        """Rows within `depth` hops of `row`, ignoring edge direction.
+
+        Returns (rows, hops) as sorted row ids with their hop distance; the
+        expansion stops early once `max_nodes` rows have been collected.
+        """
+        out_indptr, out_indices, in_indptr, in_indices = self._snapshot()
+        visited = np.array([row], dtype=np.int32)
+        hops = np.array([0], dtype=np.int32)
+        frontier = visited
+        for hop in range(1, depth + 1):
+            if not len(frontier) or len(visited) >= max_nodes:
+                break
+            neighbors = np.unique(np.concatenate([
+                gather(out_indptr, out_indices, frontier),
+                gather(in_indptr, in_indices, frontier),
+            ]))
+            frontier = np.setdiff1d(neighbors, visited, assume_unique=True)
+            frontier = frontier[:max_nodes - len(visited)]
+            visited = np.concatenate([visited, frontier])
+            hops = np.concatenate([hops, np.full(len(frontier), hop, dtype=np.int32)])
+        order = np.argsort(visited)
+        return visited[order], hops[order]
+
+    def density(self, rows):
+        """Directed edge density of the subgraph induced by sorted `rows`"""
+        n = len(rows)
+        if n < 2:
+            return 0.0
+        out_indptr, out_indices, _, _ = self._snapshot()
+        targets = gather(out_indptr, out_indices, rows)
+        positions = np.searchsorted(rows, targets).clip(max=n - 1)
+        internal = int(np.count_nonzero(rows[positions] == targets))
+        return internal / (n * (n - 1))
+
+    def clustering_coefficient(self, row):
+        """Local clustering coefficient of `row` on the undirected graph"""
+        out_indptr, out_indices, in_indptr, in_indices = self._snapshot()
+        neighbors = np.union1d(out_indices[out_indptr[row]:out_indptr[row + 1]],
+                               in_indices[in_indptr[row]:in_indptr[row + 1]])
+        neighbors = neighbors[neighbors != row]
+        k = len(neighbors)
+        if k < 2:
+            return 0.0
+
+        lengths = out_indptr[neighbors + 1] - out_indptr[neighbors]
+        sources = np.repeat(neighbors, lengths)
+        targets = gather(out_indptr, out_indices, neighbors)
+        positions = np.searchsorted(neighbors, targets).clip(max=k - 1)
+        mask = (neighbors[positions] == targets) & (sources != targets)
+        # Count each undirected link between two neighbours once
+        pairs = np.unique(np.stack([np.minimum(sources[mask], targets[mask]),
+                                    np.maximum(sources[mask], targets[mask])]), axis=1)
+        return 2 * pairs.shape[1] / (k * (k - 1))
@@ -0,0 +1,156 @@
+"""
+BIOLIT INTELLIGENCE - CLAIM MATCHER (claim_matcher.py)
+Known-claim rules compiled into an Aho-Corasick automaton.
+
+A rule lists term groups; it fires when every group has at least one term
+present in the claim (case-insensitive substring match, like the original
+checks). All terms of all rules are matched in a single pass over the claim,
+so cost is linear in claim length however many rules are loaded.
+
+Rules live in a JSON file (data/claim_rules.json) and are reloaded when the
+file changes, without restarting workers. Earlier rules win ties.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+VERDICT_FIELDS = ('status', 'confidence_score', 'verdict', 'explanation', 'sources', 'supporting_papers')
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher"""
+
+    def __init__(self, patterns):
+        """`patterns` is an iterable of (pattern, payload) pairs"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, payload in patterns:
+            node = 0
+            for ch in pattern:
+                next_node = self.goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][ch] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = next_node
+            self.output[node].append(payload)
+
+        # Breadth-first failure links; outputs of suffix states are merged in
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text):
+        """Yield the payload of every pattern occurrence in `text`"""
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                yield from output[node]
+
+
+class RuleSet:
+    """Compiled rules: one automaton over every term of every rule"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.group_counts = [len(rule['terms']) for rule in rules]
+        patterns = []
+        for rule_index, rule in enumerate(rules):
+            for group_index, group in enumerate(rule['terms']):
+                for term in group:
+                    patterns.append((term.lower(), (rule_index, group_index)))
+        self.automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            rules = json.load(f)['rules']
+        for rule in rules:
+            if not rule.get('id') or not rule.get('terms') or not all(rule['terms']):
+                raise ValueError(f"Invalid claim rule: {rule.get('id', rule)}")
+        return cls(rules)
+
+    def match(self, text):
+        """Rules whose every term group occurs in `text`, best first"""
+        seen_groups = {}
+        for rule_index, group_index in self.automaton.iter_matches(text.lower()):
+            seen_groups.setdefault(rule_index, set()).add(group_index)
+        fired = [i for i, groups in seen_groups.items() if len(groups) == self.group_counts[i]]
+        return [self.rules[i] for i in sorted(fired)]
+
+
+class ClaimMatcher:
+    """Hot-reloading wrapper around a RuleSet loaded from a JSON file"""
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.rule_set = RuleSet([])
+        self.reload()
+
+    def reload(self):
+        """Recompile if the rule file changed; a broken file keeps the old rules"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            print(f"Claim rules not found: {self.path}")
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            rule_set = RuleSet.load(self.path)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Claim rules not reloaded ({self.path}): {str(e)}")
+            self._mtime = mtime
+            return
+        self.rule_set = rule_set
+        self._mtime = mtime
+        self.reloads += 1
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                self.reload()
+
+    def match(self, claim):
+        """Best matching rule for `claim`, or None"""
+        self._maybe_reload()
+        fired = self.rule_set.match(claim)
+        return fired[0] if fired else None
+
+    @staticmethod
+    def verdict(rule):
+        """Analysis fields driven by a rule"""
+        return {field: rule[field] for field in VERDICT_FIELDS if field in rule}
+
+    def stats(self):
+        return {
+            'rules': len(self.rule_set.rules),
+            'states': len(self.rule_set.automaton.goto),
+            'reloads': self.reloads,
+        }
@@ -4,4 +4,57 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Config:
-    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
\ No newline at end of file
+    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+    # Directory of an on-disk paper store (see paper_store.py); when unset or
+    # missing, the built-in mock corpus is served from memory
+    PAPER_STORE_DIR = os.getenv("PAPER_STORE_DIR")
+    # Seconds between checks for rows appended to the store by ingest.py;
+    # each worker indexes them in one batch (0 disables the check)
+    STORE_SYNC_SECONDS = float(os.getenv("STORE_SYNC_SECONDS", "10"))
+
+    # Precompute top-k recommendations for every paper in a background thread
+    RECOMMENDATION_PRECOMPUTE = os.getenv("RECOMMENDATION_PRECOMPUTE", "1") == "1"
+
+    # Leave background threads to start_background_jobs() after fork; set by
+    # gunicorn.conf.py, which builds the indexes once in the master process
+    DEFER_BACKGROUND_JOBS = os.getenv("DEFER_BACKGROUND_JOBS", "0") == "1"
+
+    # Response cache for read-heavy endpoints; set RESPONSE_CACHE_REDIS_URL to
+    # share entries between gunicorn workers
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+    # LLM client (Groq's OpenAI-compatible API, or mock_llm_server.py offline)
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+    GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+    # Disk cache for generated study notes (defaults to instance/notes_cache)
+    NOTES_CACHE_DIR = os.getenv("NOTES_CACHE_DIR")
+    NOTES_CACHE_MAX_BYTES = int(os.getenv("NOTES_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    # Known-claim rules for the credibility check (defaults to data/claim_rules.json);
+    # the file is re-read when it changes, at most once per interval
+    CLAIM_RULES_PATH = os.getenv("CLAIM_RULES_PATH")
+    CLAIM_RULES_RELOAD_SECONDS = float(os.getenv("CLAIM_RULES_RELOAD_SECONDS", "2"))
+
+    # Grants catalog for the grant matcher (defaults to data/grants.json)
+    GRANTS_PATH = os.getenv("GRANTS_PATH")
+
+    # Pre-encoded JSON of recently served papers, in rows (see fast_json.py)
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "100000"))
+
+    # IVF lists probed per semantic search query (more = better recall, slower)
+    SEMANTIC_NPROBE = int(os.getenv("SEMANTIC_NPROBE", "8"))
+
+    # Sampling profiler for slow requests (toggle at runtime via /api/metrics/profiler);
+    # folded stacks are written to PROFILE_DIR (defaults to instance/profiles)
+    PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "0") == "1"
+    PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR")
+    # Bearer token required to change profiler settings; unset disables changes
+    PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
@@ -0,0 +1,46 @@
+"""
+BIOLIT INTELLIGENCE - EVIDENCE RETRIEVAL (evidence.py)
+Ranks the corpus against claim text for the credibility check.
+
+Claims are scored with the search index's BM25F. Papers whose title or
+abstract carries a negation or contrast cue (not, however, failed,
+contradicts, ...) are reported as conflicting research; the rest as
+supporting. Batches share tokenization and per-term scoring, cues are only
+looked up for the matched papers, and each list is cut to a bounded top-k
+without sorting every match.
+"""
+
+from search_index import tokenize, top_k
+
+EVIDENCE_LIMIT = 5
+
+# Words that carry no evidence on their own
+CLAIM_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for',
+    'from', 'has', 'have', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that',
+    'the', 'this', 'to', 'was', 'were', 'will', 'with',
+})
+
+# Negation and contrast words that mark a paper as qualifying or contradicting a claim
+CONTRAST_TERMS = frozenset({
+    'contrary', 'contradict', 'contradicted', 'contradicts', 'despite', 'fail', 'failed',
+    'fails', 'however', 'inconclusive', 'ineffective', 'no', 'not', 'refute', 'refuted',
+    'refutes', 'unlike',
+})
+
+
+def claim_query(claim):
+    return ' '.join(term for term in tokenize(claim) if term not in CLAIM_STOPWORDS)
+
+
+def retrieve_evidence(index, claims, limit=EVIDENCE_LIMIT):
+    """Return (supporting, conflicting) lists of (row, score) for each claim"""
+    batch_scores = index.search_many(claim_query(claim) for claim in claims)
+    candidates = set().union(*batch_scores)
+    contrast_rows = index.rows_containing(CONTRAST_TERMS, fields=('title', 'abstract'), rows=candidates)
+    results = []
+    for scores in batch_scores:
+        supporting = top_k(((row, score) for row, score in scores.items() if row not in contrast_rows), limit)
+        conflicting = top_k(((row, score) for row, score in scores.items() if row in contrast_rows), limit)
+        results.append((supporting, conflicting))
+    return results
@@ -0,0 +1,138 @@
+"""
+BIOLIT INTELLIGENCE - FAST JSON (fast_json.py)
+JSON encoding for API responses, with pre-encoded paper fragments.
+
+dumps/loads use orjson when it is installed and fall back to the standard
+library otherwise; both sort keys, matching Flask's default output.
+FastJSONProvider plugs them into Flask, so every jsonify() goes through the
+faster encoder and may contain Fragments.
+
+Paper records never change once stored (re-ingestion appends a new row), so
+each row is encoded once into a Fragment and kept in a bounded LRU.
+Responses listing papers are assembled from those bytes: per-request fields
+such as relevance_score are spliced into the encoded object instead of
+copying the paper dict and re-encoding it.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+else:
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+DEFAULT_FRAGMENT_CACHE_SIZE = 100_000
+
+
+def dumps(obj):
+    """Compact, key-sorted UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) take the slow path
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                      default=DefaultJSONProvider.default).encode('utf-8')
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class Fragment:
+    """An already-encoded JSON object, spliced verbatim into the output"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def merge(self, fields):
+        """A new fragment with `fields` appended to this object's members"""
+        if not fields:
+            return self
+        extra = dumps(fields)
+        separator = b',' if len(self.data) > 2 else b''
+        return Fragment(self.data[:-1] + separator + extra[1:])
+
+
+def encode(obj):
+    """dumps() for payloads that may contain Fragments"""
+    if isinstance(obj, Fragment):
+        return obj.data
+    if isinstance(obj, dict):
+        if not any(isinstance(value, (Fragment, dict, list, tuple)) for value in obj.values()):
+            return dumps(obj)
+        members = (dumps(str(key)) + b':' + encode(obj[key]) for key in sorted(obj, key=str))
+        return b'{' + b','.join(members) + b'}'
+    if isinstance(obj, (list, tuple)):
+        if not any(isinstance(value, (Fragment, dict, list, tuple)) for value in obj):
+            return dumps(obj)
+        return b'[' + b','.join(encode(value) for value in obj) + b']'
+    return dumps(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by encode/loads above, so jsonify() accepts Fragments"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent'):
+            # Pretty output (debug mode) is rare enough to round-trip
+            return super().dumps(loads(encode(obj)), **kwargs)
+        return encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(encode(obj), mimetype=self.mimetype)
+
+
+class FragmentCache:
+    """Row -> Fragment LRU over an append-only paper store"""
+
+    def __init__(self, store, max_entries=DEFAULT_FRAGMENT_CACHE_SIZE):
+        self.store = store
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, row, paper=None):
+        """Fragment of a stored row; pass `paper` when it is already decoded"""
+        with self._lock:
+            fragment = self._entries.get(row)
+            if fragment is not None:
+                self._entries.move_to_end(row)
+                self.hits += 1
+                return fragment
+        fragment = Fragment(dumps(paper if paper is not None else self.store.row(row)))
+        with self._lock:
+            self.misses += 1
+            self._entries[row] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'encoder': 'orjson' if orjson is not None else 'json',
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,222 @@
+"""
+BIOLIT INTELLIGENCE - GAP ANALYSIS (gap_analysis.py)
+Research gaps derived from per-topic publication time series.
+
+Every keyword is a topic. Paper counts and citation sums are held in
+year x topic NumPy arrays, one row per year that has papers (an outlier
+year costs one row, not the span up to it), with running per-topic totals,
+and updated in place as papers are ingested or superseded. Saturation, year-over-year
+growth, citation impact and the opportunity score are computed for all
+topics in one vectorized pass over the latest two year rows, so a request
+costs a slice and a top-k sort rather than a corpus scan.
+
+A `field` narrows the analysis to topics named by the field plus the topics
+that co-occur with them in papers.
+"""
+
+import threading
+from collections import Counter
+
+import numpy as np
+
+from paper_store import iter_live
+from search_index import tokenize
+
+# Opportunity score weights: room left, momentum, citation impact
+OPPORTUNITY_WEIGHTS = (0.4, 0.35, 0.25)
+# YoY growth at or above this counts as full momentum
+GROWTH_CAP = 2.0
+TREND_YEARS = 5
+
+
+def topic_key(keyword):
+    return ' '.join(keyword.lower().split())
+
+
+class TopicTimeSeries:
+    """Year x topic paper counts and citation sums, maintained incrementally"""
+
+    def __init__(self, topic_capacity=64):
+        self.topics = []           # topic id -> display name
+        self.topic_ids = {}        # topic key -> id
+        self.year_rows = {}        # year -> row of the arrays below
+        self.counts = np.zeros((0, topic_capacity), dtype=np.int32)
+        self.citations = np.zeros((0, topic_capacity), dtype=np.int64)
+        self.total_counts = np.zeros(topic_capacity, dtype=np.int64)
+        self.total_citations = np.zeros(topic_capacity, dtype=np.int64)
+        self.year_counts = np.zeros(0, dtype=np.int64)
+        # Field term -> topic ids whose name contains it
+        self.topic_terms = {}
+        # Topic id -> Counter of co-occurring topic ids, for field filtering
+        self.cooccurrence = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_store(cls, store):
+        series = cls()
+        with series._lock:
+            for row, paper in iter_live(store):
+                series._apply(paper, 1)
+        return series
+
+    # ---------- maintenance ----------
+
+    def _topic(self, keyword):
+        key = topic_key(keyword)
+        topic = self.topic_ids.get(key)
+        if topic is None:
+            topic = self.topic_ids[key] = len(self.topics)
+            self.topics.append(keyword.strip())
+            self.cooccurrence.append(Counter())
+            for term in set(tokenize(key)):
+                self.topic_terms.setdefault(term, set()).add(topic)
+            if topic >= self.counts.shape[1]:
+                grow = self.counts.shape[1]
+                self.counts = np.pad(self.counts, ((0, 0), (0, grow)))
+                self.citations = np.pad(self.citations, ((0, 0), (0, grow)))
+                self.total_counts = np.pad(self.total_counts, (0, grow))
+                self.total_citations = np.pad(self.total_citations, (0, grow))
+        return topic
+
+    def _year_row(self, year):
+        row = self.year_rows.get(year)
+        if row is None:
+            row = self.year_rows[year] = self.counts.shape[0]
+            self.counts = np.pad(self.counts, ((0, 1), (0, 0)))
+            self.citations = np.pad(self.citations, ((0, 1), (0, 0)))
+            self.year_counts = np.pad(self.year_counts, (0, 1))
+        return row
+
+    def _year_counts(self, year, columns):
+        """Paper counts of `columns` in `year` (zeros for a year without papers)"""
+        row = self.year_rows.get(year)
+        return self.counts[row, columns] if row is not None else np.zeros(len(columns), dtype=np.int32)
+
+    def _apply(self, paper, sign):
+        year = int(paper['year'] or 0)
+        if year <= 0:
+            # Unknown year (stored as 0): it has no place in the time series
+            return
+        topics = sorted({self._topic(keyword) for keyword in paper['keywords'] if keyword.strip()})
+        if not topics:
+            return
+        row = self._year_row(year)
+        columns = np.array(topics)
+        self.counts[row, columns] += sign
+        self.citations[row, columns] += sign * paper['citations']
+        self.total_counts[columns] += sign
+        self.total_citations[columns] += sign * paper['citations']
+        self.year_counts[row] += sign
+        for topic in topics:
+            cooccurring = self.cooccurrence[topic]
+            for other in topics:
+                if other == topic:
+                    continue
+                count = cooccurring[other] + sign
+                if count > 0:
+                    cooccurring[other] = count
+                else:
+                    # Pairs only drop to zero on removal; delete them there
+                    cooccurring.pop(other, None)
+
+    def add(self, row, paper):
+        with self._lock:
+            self._apply(paper, 1)
+
+    def add_rows(self, store, rows):
+        with self._lock:
+            for row in rows:
+                self._apply(store.row(row), 1)
+
+    def remove_row(self, store, row):
+        """Subtract a superseded row from the series"""
+        with self._lock:
+            self._apply(store.row(row), -1)
+
+    # ---------- analysis ----------
+
+    def field_topics(self, field):
+        """Topic ids naming every term of `field` plus their co-occurring topics, or None for all"""
+        terms = set(tokenize(field or ''))
+        if not terms:
+            return None
+        named = set.intersection(*(self.topic_terms.get(term, set()) for term in terms))
+        selected = set(named)
+        for topic in named:
+            selected.update(self.cooccurrence[topic])
+        return np.array(sorted(selected), dtype=np.int64)
+
+    def latest_year(self):
+        active = [year for year, row in self.year_rows.items() if self.year_counts[row] > 0]
+        return max(active) if active else None
+
+    def analyze(self, field=None, limit=10):
+        """Top `limit` topics by opportunity score, and the year they were scored for"""
+        with self._lock:
+            year = self.latest_year()
+            if year is None:
+                return [], None
+            topic_count = len(self.topics)
+            columns = self.field_topics(field)
+            if columns is None:
+                columns = np.arange(topic_count)
+            columns = columns[self.total_counts[columns] > 0]
+            if not len(columns):
+                return [], year
+
+            current = self._year_counts(year, columns).astype(np.float64)
+            previous = self._year_counts(year - 1, columns).astype(np.float64)
+            totals = self.total_counts[columns].astype(np.float64)
+            impact = self.total_citations[columns] / totals
+            trend_years = range(max(min(self.year_rows), year - TREND_YEARS + 1), year + 1)
+            trend = np.stack([self._year_counts(y, columns) for y in trend_years])
+
+        saturation = totals / totals.max()
+        # A topic with no papers last year counts as 100% growth if it has any now
+        growth = np.where(previous > 0, (current - previous) / np.maximum(previous, 1),
+                          np.where(current > 0, 1.0, 0.0))
+        momentum = np.clip(growth, 0, GROWTH_CAP) / GROWTH_CAP
+        impact_norm = impact / impact.max() if impact.max() > 0 else np.zeros(len(columns))
+        room_weight, momentum_weight, impact_weight = OPPORTUNITY_WEIGHTS
+        scores = 10 * (room_weight * (1 - saturation) + momentum_weight * momentum + impact_weight * impact_norm)
+
+        count = min(limit, len(columns))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.lexsort((columns[top], -scores[top]))]
+
+        gaps = []
+        for rank, i in enumerate(top.tolist(), 1):
+            gaps.append({
+                'rank': rank,
+                'topic': self.topics[columns[i]],
+                'saturation_level': f"{saturation_label(saturation[i])} ({int(totals[i])} papers)",
+                'year': year,
+                'current_papers': int(current[i]),
+                'growth_rate': f"{round(growth[i] * 100)}% YoY",
+                'average_citations': round(float(impact[i]), 1),
+                'opportunity_score': round(float(scores[i]), 1),
+                'status': gap_status(saturation[i], growth[i]),
+                'trend': {str(y): int(trend[j, i]) for j, y in enumerate(trend_years)},
+            })
+        return gaps, year
+
+    def stats(self):
+        return {'topics': len(self.topics), 'years': len(self.year_rows)}
+
+
+def saturation_label(saturation):
+    if saturation < 0.33:
+        return 'Low'
+    if saturation < 0.66:
+        return 'Medium'
+    return 'High'
+
+
+def gap_status(saturation, growth):
+    if growth < 0:
+        return 'Declining Interest'
+    if growth >= 1:
+        return 'High Growth Area'
+    if saturation < 0.33 and growth > 0:
+        return 'Emerging Opportunity'
+    return 'Active Research Area'
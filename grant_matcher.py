@@ -0,0 +1,139 @@
+"""
+BIOLIT INTELLIGENCE - GRANT MATCHER (grant_matcher.py)
+Grants catalog indexed by focus-area terms, with vectorized scoring.
+
+Each grant's focus areas become an L2-normalized TF-IDF vector stored as
+term postings (grant ids, weights). A query (the research area, optionally
+with a paper's keywords at a lower weight) is scored against every grant in
+one np.bincount over the postings of its terms.
+
+Deadlines are kept in a sorted array, so the open window of a request is a
+searchsorted slice. Funding totals for any window come from prefix sums.
+Results are the top-k of the window by argpartition.
+"""
+
+import json
+import math
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+from search_index import tokenize
+
+# Paper keywords refine the research area but should not outweigh it
+KEYWORD_WEIGHT = 0.5
+
+
+def format_amount(amount):
+    if amount >= 1_000_000_000:
+        return f"${amount / 1_000_000_000:.1f}B"
+    if amount >= 1_000_000:
+        return f"${amount / 1_000_000:.1f}M"
+    return f"${amount / 1_000:.0f}K"
+
+
+class GrantCatalog:
+    """Funding calls with a focus-term index and a sorted deadline index"""
+
+    def __init__(self, grants):
+        self.grants = list(grants)
+        count = len(self.grants)
+
+        term_counts = [Counter(tokenize(' '.join(grant['focus_areas']))) for grant in self.grants]
+        doc_freq = Counter(term for counts in term_counts for term in counts)
+        self.idf = {term: math.log(1 + count / df) for term, df in doc_freq.items()}
+
+        postings = {}
+        for grant_id, counts in enumerate(term_counts):
+            weights = {term: tf * self.idf[term] for term, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(grant_id)
+                postings[term][1].append(weight / norm)
+        self.postings = {term: (np.array(ids, dtype=np.int64), np.array(weights))
+                         for term, (ids, weights) in postings.items()}
+        self.grant_terms = [set(counts) for counts in term_counts]
+
+        # Deadline index: ordinal days, sorted, with funding prefix sums
+        deadlines = np.array([date.fromisoformat(grant['deadline']).toordinal() for grant in self.grants],
+                             dtype=np.int64)
+        self.by_deadline = np.argsort(deadlines, kind='stable')
+        self.sorted_deadlines = deadlines[self.by_deadline]
+        amounts = np.array([grant.get('amount_max', 0) for grant in self.grants], dtype=np.float64)
+        self.funding_prefix = np.concatenate([[0.0], np.cumsum(amounts[self.by_deadline])])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['grants'])
+
+    def __len__(self):
+        return len(self.grants)
+
+    def window(self, opens_after=None, closes_before=None):
+        """Slice of the deadline order between two dates (inclusive)"""
+        lo = 0
+        hi = len(self.sorted_deadlines)
+        if opens_after is not None:
+            lo = int(np.searchsorted(self.sorted_deadlines, opens_after.toordinal(), side='left'))
+        if closes_before is not None:
+            hi = int(np.searchsorted(self.sorted_deadlines, closes_before.toordinal(), side='right'))
+        return lo, max(lo, hi)
+
+    def query_vector(self, research_area, keywords=()):
+        weights = Counter()
+        for term in tokenize(research_area or ''):
+            weights[term] += 1.0
+        for term in tokenize(' '.join(keywords)):
+            weights[term] += KEYWORD_WEIGHT
+        return {term: weight * self.idf[term] for term, weight in weights.items() if term in self.idf}
+
+    def scores(self, query):
+        """Cosine similarity of the query against every grant"""
+        scores = np.zeros(len(self.grants))
+        if not query:
+            return scores
+        ids = np.concatenate([self.postings[term][0] for term in query])
+        weights = np.concatenate([self.postings[term][1] * query[term] for term in query])
+        scores = np.bincount(ids, weights=weights, minlength=len(self.grants))
+        return scores / math.sqrt(sum(w * w for w in query.values()))
+
+    def match(self, research_area, keywords=(), limit=10, opens_after=None, closes_before=None):
+        """Top grants in the deadline window, best match first, plus window totals"""
+        lo, hi = self.window(opens_after, closes_before)
+        candidates = self.by_deadline[lo:hi]
+        query = self.query_vector(research_area, keywords)
+        window_scores = self.scores(query)[candidates]
+
+        matched = np.flatnonzero(window_scores > 0)
+        count = min(limit, len(matched))
+        if count:
+            top = matched[np.argpartition(-window_scores[matched], count - 1)[:count]]
+            # Best score first; earlier deadline breaks ties
+            top = top[np.lexsort((top, -window_scores[top]))]
+        else:
+            top = matched[:0]
+
+        results = []
+        for rank, position in enumerate(top.tolist(), 1):
+            grant_id = int(candidates[position])
+            grant = self.grants[grant_id]
+            results.append({
+                'rank': rank,
+                'id': grant.get('id'),
+                'name': grant['name'],
+                'amount': grant.get('amount'),
+                'deadline': grant['deadline'],
+                'match_score': round(float(window_scores[position]) * 100),
+                'eligibility': grant.get('eligibility'),
+                'focus_areas': grant['focus_areas'],
+                'matched_terms': sorted(self.grant_terms[grant_id] & set(query)),
+                'website': grant.get('website'),
+            })
+        return results, {
+            'open_grants': hi - lo,
+            'open_funding': float(self.funding_prefix[hi] - self.funding_prefix[lo]),
+            'matched_grants': len(matched),
+        }
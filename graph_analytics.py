@@ -0,0 +1,200 @@
+"""
+BIOLIT INTELLIGENCE - GRAPH ANALYTICS (graph_analytics.py)
+Offline influence metrics over the whole citation graph.
+
+Computes PageRank, HITS hub/authority scores and weakly connected components
+with vectorized sparse matrix-vector iterations; component detection is
+split across a process pool. Results are persisted as .npy files next to
+the paper store and memory-mapped by the app, so requests never recompute
+them.
+
+    python graph_analytics.py --store data/paper_store --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from citation_graph import CitationGraph
+from paper_store import MmapPaperStore
+
+METRICS_DIRNAME = 'graph_metrics'
+METRIC_ARRAYS = ('pagerank', 'hub', 'authority', 'component')
+
+
+def edge_arrays(graph):
+    """(row_count, sources, targets) of the graph's out-edges"""
+    out_indptr, out_indices, _, _ = graph._snapshot()
+    row_count = len(out_indptr) - 1
+    sources = np.repeat(np.arange(row_count, dtype=np.int32), np.diff(out_indptr))
+    return row_count, sources, out_indices
+
+
+def pagerank(row_count, sources, targets, damping=0.85, tol=1e-9, max_iter=100):
+    """Power iteration; dangling rows spread their rank uniformly"""
+    if not row_count:
+        return np.zeros(0)
+    out_degree = np.bincount(sources, minlength=row_count).astype(np.float64)
+    dangling = out_degree == 0
+    inv_degree = np.divide(1.0, out_degree, out=np.zeros(row_count), where=~dangling)
+
+    rank = np.full(row_count, 1.0 / row_count)
+    for _ in range(max_iter):
+        flow = np.bincount(targets, weights=(rank * inv_degree)[sources], minlength=row_count)
+        new_rank = (1 - damping) / row_count + damping * (flow + rank[dangling].sum() / row_count)
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank
+
+
+def hits(row_count, sources, targets, tol=1e-9, max_iter=100):
+    """HITS hub and authority scores, each normalized to sum to 1"""
+    hub = np.full(row_count, 1.0 / max(row_count, 1))
+    authority = hub
+    for _ in range(max_iter):
+        authority = np.bincount(targets, weights=hub[sources], minlength=row_count).astype(np.float64)
+        authority /= authority.sum() or 1.0
+        new_hub = np.bincount(sources, weights=authority[targets], minlength=row_count).astype(np.float64)
+        new_hub /= new_hub.sum() or 1.0
+        delta = np.abs(new_hub - hub).sum()
+        hub = new_hub
+        if delta < tol:
+            break
+    return hub, authority
+
+
+def min_label_components(node_count, sources, targets):
+    """Label every node with the smallest node id in its component.
+
+    Hooks the larger root of each edge onto the smaller one, then compresses
+    label chains by pointer jumping, until no edge spans two labels.
+    """
+    labels = np.arange(node_count, dtype=np.int64)
+    while True:
+        source_labels, target_labels = labels[sources], labels[targets]
+        spanning = source_labels != target_labels
+        if not spanning.any():
+            return labels
+        low = np.minimum(source_labels[spanning], target_labels[spanning])
+        high = np.maximum(source_labels[spanning], target_labels[spanning])
+        np.minimum.at(labels, high, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def _chunk_components(edges):
+    """Pool worker: collapse one edge chunk to (node, local representative) pairs"""
+    sources, targets = edges
+    nodes = np.unique(np.concatenate([sources, targets]))
+    local = min_label_components(len(nodes),
+                                 np.searchsorted(nodes, sources),
+                                 np.searchsorted(nodes, targets))
+    return nodes, nodes[local]
+
+
+def weakly_connected_components(row_count, sources, targets, workers=1, chunk_size=5_000_000):
+    """Component label per row, with edge chunks reduced in a process pool"""
+    if not len(sources):
+        return np.arange(row_count, dtype=np.int64)
+    chunks = [(sources[i:i + chunk_size], targets[i:i + chunk_size])
+              for i in range(0, len(sources), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reduced = list(pool.map(_chunk_components, chunks))
+    else:
+        reduced = [_chunk_components(chunk) for chunk in chunks]
+
+    # Each chunk contributes at most one edge per node it touches
+    nodes = np.concatenate([n for n, _ in reduced])
+    representatives = np.concatenate([r for _, r in reduced])
+    return min_label_components(row_count, nodes, representatives)
+
+
+def compute_metrics(graph, workers=1):
+    row_count, sources, targets = edge_arrays(graph)
+    hub, authority = hits(row_count, sources, targets)
+    return {
+        'pagerank': pagerank(row_count, sources, targets),
+        'hub': hub,
+        'authority': authority,
+        'component': weakly_connected_components(row_count, sources, targets, workers),
+    }
+
+
+def save_metrics(directory, metrics):
+    target = os.path.join(directory, METRICS_DIRNAME)
+    os.makedirs(target, exist_ok=True)
+    for name in METRIC_ARRAYS:
+        tmp_path = os.path.join(target, f'{name}.tmp.npy')
+        np.save(tmp_path, metrics[name])
+        os.replace(tmp_path, os.path.join(target, f'{name}.npy'))
+
+
+class GraphMetrics:
+    """Read-only view of persisted (or freshly computed) influence metrics"""
+
+    def __init__(self, metrics):
+        self.pagerank = metrics['pagerank']
+        self.hub = metrics['hub']
+        self.authority = metrics['authority']
+        self.component = metrics['component']
+        self.component_sizes = np.bincount(self.component) if len(self.component) else np.zeros(0)
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map metrics saved by save_metrics(), or None if absent"""
+        target = os.path.join(directory or '', METRICS_DIRNAME)
+        if not directory or not os.path.exists(os.path.join(target, 'pagerank.npy')):
+            return None
+        return cls({name: np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r')
+                    for name in METRIC_ARRAYS})
+
+    @property
+    def row_count(self):
+        return len(self.pagerank)
+
+    def influence(self, row):
+        """PageRank of `row`; rows ingested after the last job score 0"""
+        return float(self.pagerank[row]) if row < self.row_count else 0.0
+
+    def summary(self, row):
+        if row >= self.row_count:
+            return None
+        component = int(self.component[row])
+        return {
+            'pagerank': float(self.pagerank[row]),
+            'hub_score': float(self.hub[row]),
+            'authority_score': float(self.authority[row]),
+            'component_id': component,
+            'component_size': int(self.component_sizes[component]),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute citation graph influence metrics')
+    parser.add_argument('--store', required=True, help='Paper store directory')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    started = time.time()
+    store = MmapPaperStore(args.store)
+    graph = CitationGraph.from_store(store)
+    print(f"Loaded {len(store)} papers, {graph.edge_count} citations in {time.time() - started:.1f}s")
+
+    started = time.time()
+    metrics = compute_metrics(graph, args.workers)
+    save_metrics(args.store, metrics)
+    components = len(np.unique(metrics['component']))
+    print(f"Computed metrics ({components} components) in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+BIOLIT INTELLIGENCE - GUNICORN SETTINGS (gunicorn.conf.py)
+Read by gunicorn from the working directory (`gunicorn app:app`).
+
+The app is imported once in the master process, so the paper store and every
+index are built once and shared copy-on-write by the forked workers instead
+of being rebuilt, and held again, by each worker. Background threads do not
+survive fork and are started in every worker after it is forked.
+"""
+
+import gc
+import os
+
+preload_app = True
+
+# Read by config.py when the master imports app.py
+os.environ['DEFER_BACKGROUND_JOBS'] = '1'
+
+
+def pre_fork(server, worker):
+    # Objects built at import are never collected; freezing them keeps the
+    # collector from writing to (and so un-sharing) their pages in workers
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app
+    app.start_background_jobs()
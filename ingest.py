@@ -0,0 +1,326 @@
+"""
+BIOLIT INTELLIGENCE - BULK INGESTION (ingest.py)
+Streams PubMed baseline XML or NDJSON dumps into the paper store.
+
+The reader never holds more than a few chunks of the file. It cuts the raw
+bytes at record boundaries (</PubmedArticle> or newlines) into fixed-size
+slabs, and a process pool parses each slab with iterparse, clearing elements
+as it goes and normalizing records into the paper schema. Records are
+appended in file order, in batches, straight to the memory-mapped store;
+this process builds no indexes and keeps no per-paper state, so its memory
+stays flat however large the dump. Records without a usable id, title or
+publication year are skipped.
+
+A running server picks the new rows up by itself: every STORE_SYNC_SECONDS
+each worker remaps the store and indexes the appended rows in one batch
+(app.sync_store). A re-ingested id supersedes its older row, which the
+workers drop from their indexes at the same time; the store also works
+superseded rows out from the id column when it is opened, so they stay
+out after a restart.
+
+    python ingest.py pubmed25n0001.xml.gz --store data/paper_store --workers 4
+    python ingest.py papers.ndjson --store data/paper_store
+
+Throughput and peak memory (this process and the largest worker) are
+reported at the end. Run graph_analytics.py and semantic_index.py
+afterwards to refresh the offline indexes.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+ARTICLE_START = b'<PubmedArticle>'
+ARTICLE_END = b'</PubmedArticle>'
+CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 5000
+MAX_KEYWORDS = 15
+YEAR_RE = re.compile(r'\d{4}')
+# The store's year column is a 16-bit integer
+MAX_YEAR = 9999
+
+
+# ---------- normalization (runs in worker processes) ----------
+
+def element_text(element):
+    return ' '.join(''.join(element.itertext()).split()) if element is not None else ''
+
+
+def valid_year(year):
+    """`year` as an int if it is a plausible publication year, else None"""
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return None
+    return year if 0 < year <= MAX_YEAR else None
+
+
+def publication_year(article):
+    """Publication year of an <Article>, or None if it has none"""
+    for path in ('Journal/JournalIssue/PubDate/Year', 'ArticleDate/Year'):
+        year = valid_year((article.findtext(path) or '').strip())
+        if year is not None:
+            return year
+    match = YEAR_RE.search(article.findtext('Journal/JournalIssue/PubDate/MedlineDate') or '')
+    return valid_year(match.group()) if match else None
+
+
+def author_name(author):
+    """'Smith, J.' in the corpus' display format"""
+    last_name = author.findtext('LastName')
+    if not last_name:
+        return author.findtext('CollectiveName') or ''
+    initials = author.findtext('Initials') or ''.join(part[0] for part in (author.findtext('ForeName') or '').split())
+    return f"{last_name}, {'.'.join(initials)}." if initials else last_name
+
+
+def normalize_pubmed(element):
+    """Paper record from a <PubmedArticle> element, or None if it has no PMID or year"""
+    citation = element.find('MedlineCitation')
+    pmid = citation.findtext('PMID') if citation is not None else None
+    if not pmid or not pmid.strip().isdigit():
+        return None
+    article = citation.find('Article')
+    if article is None:
+        return None
+    year = publication_year(article)
+    if year is None:
+        return None
+
+    keywords = [element_text(k) for k in citation.iterfind('KeywordList/Keyword')]
+    keywords += [element_text(d) for d in citation.iterfind('MeshHeadingList/MeshHeading/DescriptorName')]
+    references = []
+    for article_id in element.iterfind('PubmedData/ReferenceList/Reference/ArticleIdList/ArticleId'):
+        if article_id.get('IdType') == 'pubmed' and (article_id.text or '').strip().isdigit():
+            references.append(int(article_id.text))
+
+    return {
+        'id': int(pmid),
+        'title': element_text(article.find('ArticleTitle')),
+        'authors': [name for name in map(author_name, article.iterfind('AuthorList/Author')) if name],
+        'year': year,
+        'journal': article.findtext('Journal/Title') or '',
+        'citations': 0,
+        'impact_factor': 0.0,
+        'abstract': ' '.join(element_text(text) for text in article.iterfind('Abstract/AbstractText')),
+        'keywords': list(dict.fromkeys(k for k in keywords if k))[:MAX_KEYWORDS],
+        'h_index': 0,
+        'references': references,
+    }
+
+
+def normalize_record(record):
+    """Coerce a JSON record into the paper schema, or None if it lacks an id, title or year"""
+    if not isinstance(record, dict) or record.get('id') is None or not record.get('title'):
+        return None
+    year = valid_year(record.get('year'))
+    if year is None:
+        return None
+    try:
+        return {
+            'id': int(record['id']),
+            'title': str(record['title']),
+            'authors': [str(a) for a in record.get('authors') or []],
+            'year': year,
+            'journal': str(record.get('journal') or ''),
+            'citations': int(record.get('citations') or 0),
+            'impact_factor': float(record.get('impact_factor') or 0.0),
+            'abstract': str(record.get('abstract') or ''),
+            'keywords': [str(k) for k in record.get('keywords') or []][:MAX_KEYWORDS],
+            'h_index': int(record.get('h_index') or 0),
+            'references': [int(r) for r in record.get('references') or []],
+        }
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_xml_chunk(data):
+    """Normalize every complete <PubmedArticle> in a slab; returns (papers, skipped)"""
+    start = data.find(ARTICLE_START)
+    if start < 0:
+        return [], 0
+    papers, skipped = [], 0
+    source = io.BytesIO(b'<PubmedArticleSet>' + data[start:] + b'</PubmedArticleSet>')
+    try:
+        for _, element in ET.iterparse(source, events=('end',)):
+            if element.tag == 'PubmedArticle':
+                paper = normalize_pubmed(element)
+                if paper is None:
+                    skipped += 1
+                else:
+                    papers.append(paper)
+                element.clear()
+    except ET.ParseError:
+        # One malformed record: retry the slab article by article
+        return parse_xml_articles(data[start:])
+    return papers, skipped
+
+
+def parse_xml_articles(data):
+    papers, skipped = [], 0
+    for chunk in data.split(ARTICLE_END)[:-1]:
+        start = chunk.find(ARTICLE_START)
+        if start < 0:
+            continue
+        try:
+            paper = normalize_pubmed(ET.fromstring(chunk[start:] + ARTICLE_END))
+        except ET.ParseError:
+            paper = None
+        if paper is None:
+            skipped += 1
+        else:
+            papers.append(paper)
+    return papers, skipped
+
+
+def parse_ndjson_chunk(data):
+    papers, skipped = [], 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            paper = normalize_record(json.loads(line))
+        except ValueError:
+            paper = None
+        if paper is None:
+            skipped += 1
+        else:
+            papers.append(paper)
+    return papers, skipped
+
+
+# ---------- reading ----------
+
+def open_source(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def iter_slabs(path, separator, chunk_bytes=CHUNK_BYTES):
+    """Yield byte slabs of about chunk_bytes that end right after a separator"""
+    with open_source(path) as f:
+        pending = b''
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            pending += block
+            cut = pending.rfind(separator)
+            if cut < 0:
+                continue
+            cut += len(separator)
+            yield pending[:cut]
+            pending = pending[cut:]
+        if pending.strip():
+            yield pending
+
+
+def source_format(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.xml'):
+        return 'xml'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if name.endswith('.json'):
+        return 'json'
+    raise ValueError(f'Unsupported file type: {path}')
+
+
+def iter_parsed(path, workers):
+    """Yield (papers, skipped) per slab, in file order, with bounded read-ahead"""
+    kind = source_format(path)
+    if kind == 'json':
+        # A JSON array has no record boundaries to cut at; NDJSON streams instead
+        with open_source(path) as f:
+            records = json.load(f)
+        papers = [paper for paper in map(normalize_record, records) if paper is not None]
+        yield papers, len(records) - len(papers)
+        return
+
+    if kind == 'xml':
+        slabs, parse = iter_slabs(path, ARTICLE_END), parse_xml_chunk
+    else:
+        slabs, parse = iter_slabs(path, b'\n'), parse_ndjson_chunk
+
+    if workers <= 1:
+        yield from map(parse, slabs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for slab in slabs:
+            in_flight.append(pool.submit(parse, slab))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def peak_memory():
+    """Peak RSS in MB of this process and of the largest finished worker"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+
+def ingest(paths, add_papers, workers=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Stream every file into add_papers in batches; returns (ingested, skipped, seconds)"""
+    started = time.perf_counter()
+    ingested = skipped = 0
+    batch = []
+    for path in paths:
+        for papers, bad in iter_parsed(path, workers):
+            skipped += bad
+            batch.extend(papers)
+            while len(batch) >= batch_size:
+                add_papers(batch[:batch_size])
+                ingested += batch_size
+                batch = batch[batch_size:]
+                elapsed = time.perf_counter() - started
+                print(f"  {ingested:,} papers ({ingested / elapsed:,.0f}/s)")
+    if batch:
+        add_papers(batch)
+        ingested += len(batch)
+    return ingested, skipped, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream PubMed XML or NDJSON dumps into the paper store')
+    parser.add_argument('paths', nargs='+', help='.xml, .ndjson/.jsonl or .json files, optionally gzipped')
+    parser.add_argument('--store', default=os.getenv('PAPER_STORE_DIR'),
+                        help='Paper store directory (created if missing; default PAPER_STORE_DIR)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    if not args.store:
+        parser.error('give --store or set PAPER_STORE_DIR')
+
+    from paper_store import MmapPaperStore
+    if MmapPaperStore.exists(args.store):
+        store = MmapPaperStore(args.store, index_ids=False)
+    else:
+        store = MmapPaperStore.create(args.store, index_ids=False)
+
+    ingested, skipped, seconds = ingest(args.paths, store.append, args.workers, args.batch_size)
+    print(f"Ingested {ingested:,} papers ({skipped:,} skipped) in {seconds:.1f}s "
+          f"({ingested / seconds if seconds else 0:,.0f} records/s)")
+    peak = peak_memory()
+    if peak:
+        print(f"Peak memory: {peak[0]:,.0f} MB (ingest), {peak[1]:,.0f} MB (largest worker)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+BIOLIT INTELLIGENCE - LLM CLIENT (llm_client.py)
+Async client for Groq's OpenAI-compatible chat completions API.
+
+Flask workers are synchronous, so all HTTP traffic runs on one event loop in
+a background thread per process. Requests share a pooled httpx.AsyncClient,
+are capped by a concurrency semaphore, and are retried with exponential
+backoff on timeouts, 429s and 5xx responses. Views call the blocking facade
+(complete, complete_many, stream), which never ties up a worker for longer
+than the configured timeout. Every failure surfaces as LLMError, so views
+can always fall back to their offline output.
+
+Point GROQ_BASE_URL at mock_llm_server.py to run everything offline.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import random
+import threading
+
+import httpx
+
+DEFAULT_BASE_URL = 'https://api.groq.com/openai/v1'
+DEFAULT_MODEL = 'llama-3.1-8b-instant'
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    pass
+
+
+class AsyncLLMClient:
+    """Pooled, rate-limited chat completions client with a sync facade"""
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL,
+                 max_concurrency=8, timeout=30.0, max_retries=2, backoff=0.5, transport=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Optional httpx transport (e.g. httpx.MockTransport in tests)
+        self.transport = transport
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._loop = None
+        self._http = None
+        self._semaphore = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            api_key=config.GROQ_API_KEY,
+            base_url=config.GROQ_BASE_URL,
+            model=config.GROQ_MODEL,
+            max_concurrency=config.LLM_MAX_CONCURRENCY,
+            timeout=config.LLM_TIMEOUT,
+            max_retries=config.LLM_MAX_RETRIES,
+        )
+
+    # ---------- event loop (one per process, created lazily after fork) ----------
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._http = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers={'Authorization': f'Bearer {self.api_key}'},
+                    timeout=httpx.Timeout(self.timeout),
+                    limits=httpx.Limits(max_connections=self.max_concurrency,
+                                        max_keepalive_connections=self.max_concurrency),
+                    transport=self.transport,
+                )
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name='llm-client', daemon=True).start()
+            ready.wait()
+            self._loop = loop
+            self._pid = os.getpid()
+            return loop
+
+    def _run(self, coroutine, timeout):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise LLMError('LLM request timed out')
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(f'LLM request failed: {e}') from e
+
+    # ---------- async core ----------
+
+    def _payload(self, messages, stream=False, **options):
+        return {'model': self.model, 'messages': messages, 'stream': stream, **options}
+
+    async def _post_with_retries(self, payload):
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            try:
+                response = await self._http.post('/chat/completions', json=payload)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error = LLMError(f'LLM API returned {response.status_code}')
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = LLMError(f'LLM request failed: {e}')
+            except httpx.HTTPStatusError as e:
+                self.failures += 1
+                raise LLMError(f'LLM API returned {e.response.status_code}')
+            except ValueError:
+                # Body that is not JSON (e.g. an HTML error page from a proxy)
+                self.failures += 1
+                raise LLMError('Malformed LLM response')
+            except Exception as e:
+                self.failures += 1
+                raise LLMError(f'LLM request failed: {e}') from e
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+        self.failures += 1
+        raise error
+
+    async def acomplete(self, messages, **options):
+        async with self._semaphore:
+            data = await self._post_with_retries(self._payload(messages, **options))
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            self.failures += 1
+            raise LLMError('Malformed LLM response')
+
+    async def acomplete_many(self, batch, **options):
+        """Fan a batch out concurrently; failed items come back as LLMError instances"""
+        return await asyncio.gather(*(self.acomplete(messages, **options) for messages in batch),
+                                    return_exceptions=True)
+
+    async def astream(self, messages, **options):
+        """Yield content deltas from a server-sent-events completion stream"""
+        async with self._semaphore:
+            self.requests += 1
+            async with self._http.stream('POST', '/chat/completions',
+                                         json=self._payload(messages, stream=True, **options)) as response:
+                if response.status_code != 200:
+                    self.failures += 1
+                    raise LLMError(f'LLM API returned {response.status_code}')
+                async for line in response.aiter_lines():
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+                    delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                    if delta:
+                        yield delta
+
+    # ---------- blocking facade for Flask views ----------
+
+    @staticmethod
+    def messages(prompt, system=None):
+        messages = [{'role': 'system', 'content': system}] if system else []
+        messages.append({'role': 'user', 'content': prompt})
+        return messages
+
+    def complete(self, prompt, system=None, timeout=None, **options):
+        return self._run(self.acomplete(self.messages(prompt, system), **options), timeout or self.timeout)
+
+    def complete_many(self, prompts, system=None, timeout=None, **options):
+        batch = [self.messages(prompt, system) for prompt in prompts]
+        return self._run(self.acomplete_many(batch, **options), timeout or self.timeout * 2)
+
+    def stream(self, prompt, system=None, timeout=None, **options):
+        """Blocking generator over content deltas, fed from the event loop"""
+        loop = self._ensure_loop()
+        chunks = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for delta in self.astream(self.messages(prompt, system), **options):
+                    chunks.put(delta)
+            except Exception as e:
+                chunks.put(e if isinstance(e, LLMError) else LLMError(str(e)))
+            finally:
+                chunks.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=timeout or self.timeout)
+                except queue.Empty:
+                    raise LLMError('LLM stream timed out')
+                if item is done:
+                    return
+                if isinstance(item, LLMError):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'max_concurrency': self.max_concurrency,
+        }
@@ -0,0 +1,282 @@
+"""
+BIOLIT INTELLIGENCE - METRICS (metrics.py)
+Request instrumentation, Prometheus exposition and a slow-request profiler.
+
+Metrics.instrument(app) times every request: per-route latency histograms,
+request counts by status and in-flight requests. Components register a
+stats() callable (caches, indexes) and every numeric field it returns is
+exported as a gauge, along with uptime and the worker's RSS.
+
+Each gunicorn worker keeps its own registry, so samples carry a `pid` label
+and a scrape sees the worker that served it.
+
+SamplingProfiler is opt-in. While enabled, a background thread samples the
+stack of every in-flight request at a fixed interval. Requests slower than
+the threshold have their samples written as folded stacks
+("frame;frame;frame count" lines), which flamegraph.pl or speedscope render
+directly.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import g, request
+
+try:
+    import resource
+except ImportError:  # Windows: RSS falls back to 0
+    resource = None
+
+# Latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = 'biolit'
+
+
+def request_elapsed_ms():
+    """Milliseconds since the current request started"""
+    started = g.get('request_started')
+    return round((time.perf_counter() - started) * 1000, 3) if started else 0.0
+
+
+def rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # Peak, not current, where /proc is unavailable; macOS reports bytes
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return 0
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+
+class Metrics:
+    """Per-process request metrics plus gauges pulled from registered stats()"""
+
+    def __init__(self, profiler=None):
+        self.started = time.time()
+        self.profiler = profiler
+        self.histograms = defaultdict(Histogram)   # (route, method) -> Histogram
+        self.requests = Counter()                  # (route, method, status) -> count
+        self.in_flight = 0
+        self.sources = {}
+        self._lock = threading.Lock()
+
+    def uptime_seconds(self):
+        return time.time() - self.started
+
+    def register(self, name, stats):
+        """Export the numeric fields of stats() as <prefix>_<name>_<field> gauges"""
+        self.sources[name] = stats
+
+    def instrument(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        g.request_started = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        if self.profiler is not None:
+            self.profiler.begin()
+
+    def _after_request(self, response):
+        started = g.get('request_started')
+        if started is not None:
+            seconds = time.perf_counter() - started
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            with self._lock:
+                self.histograms[route, request.method].observe(seconds)
+                self.requests[route, request.method, response.status_code] += 1
+            response.headers['Server-Timing'] = f'app;dur={seconds * 1000:.1f}'
+            if self.profiler is not None:
+                self.profiler.end(f'{request.method} {route}', seconds)
+        return response
+
+    def _teardown_request(self, error=None):
+        if g.get('request_started') is not None:
+            with self._lock:
+                self.in_flight -= 1
+        if self.profiler is not None:
+            self.profiler.discard()
+
+    def render(self):
+        """Prometheus text exposition (version 0.0.4)"""
+        pid = ('pid', os.getpid())
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {PREFIX}_{name} {kind}')
+
+        with self._lock:
+            histograms = {key: (list(h.counts), h.total, h.count) for key, h in self.histograms.items()}
+            requests = dict(self.requests)
+            in_flight = self.in_flight
+
+        metric('http_request_duration_seconds', 'histogram', 'Request latency by route')
+        for (route, method), (counts, total, count) in sorted(histograms.items()):
+            labels = [pid, ('route', route), ('method', method)]
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+                cumulative += bucket_count
+                lines.append(f'{PREFIX}_http_request_duration_seconds_bucket'
+                             f'{format_labels(labels + [("le", bound)])} {cumulative}')
+            lines.append(f'{PREFIX}_http_request_duration_seconds_bucket'
+                         f'{format_labels(labels + [("le", "+Inf")])} {count}')
+            lines.append(f'{PREFIX}_http_request_duration_seconds_sum{format_labels(labels)} {total:.6f}')
+            lines.append(f'{PREFIX}_http_request_duration_seconds_count{format_labels(labels)} {count}')
+
+        metric('http_requests_total', 'counter', 'Requests by route and status')
+        for (route, method, status), count in sorted(requests.items()):
+            labels = [pid, ('route', route), ('method', method), ('status', status)]
+            lines.append(f'{PREFIX}_http_requests_total{format_labels(labels)} {count}')
+
+        metric('http_request_errors_total', 'counter', 'Requests answered with a 5xx status')
+        errors = Counter()
+        for (route, method, status), count in requests.items():
+            if status >= 500:
+                errors[route, method] += count
+        for (route, method), count in sorted(errors.items()):
+            lines.append(f'{PREFIX}_http_request_errors_total'
+                         f'{format_labels([pid, ("route", route), ("method", method)])} {count}')
+
+        metric('http_requests_in_flight', 'gauge', 'Requests being served')
+        lines.append(f'{PREFIX}_http_requests_in_flight{format_labels([pid])} {in_flight}')
+        metric('process_resident_memory_bytes', 'gauge', 'Resident set size of the worker')
+        lines.append(f'{PREFIX}_process_resident_memory_bytes{format_labels([pid])} {rss_bytes()}')
+        metric('process_uptime_seconds', 'gauge', 'Seconds since the worker started')
+        lines.append(f'{PREFIX}_process_uptime_seconds{format_labels([pid])} {self.uptime_seconds():.3f}')
+
+        for source, stats in self.sources.items():
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Error collecting {source} metrics: {str(e)}")
+                continue
+            for field, value in sorted(values.items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f'{source}_{field}'
+                metric(name, 'gauge', f'{source} {field.replace("_", " ")}')
+                lines.append(f'{PREFIX}_{name}{format_labels([pid])} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """Samples in-flight request stacks and dumps folded stacks of slow requests"""
+
+    def __init__(self, directory, threshold_ms=500, interval_ms=5, max_dumps=200):
+        self.directory = directory
+        self.threshold_ms = threshold_ms
+        self.interval = interval_ms / 1000
+        self.max_dumps = max_dumps
+        self.enabled = False
+        self.dumps = 0
+        self._samples = {}      # thread id -> Counter of folded stacks
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def configure(self, enabled=None, threshold_ms=None, interval_ms=None):
+        with self._lock:
+            if threshold_ms is not None:
+                self.threshold_ms = threshold_ms
+            if interval_ms is not None:
+                self.interval = interval_ms / 1000
+            if enabled is not None:
+                self.enabled = enabled
+                if not enabled:
+                    self._samples.clear()
+            start = self.enabled and (self._thread is None or not self._thread.is_alive())
+        if start:
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def begin(self):
+        if self.enabled:
+            with self._lock:
+                self._samples[threading.get_ident()] = Counter()
+
+    def end(self, label, seconds):
+        """Dump the request's samples if it was slow"""
+        with self._lock:
+            samples = self._samples.pop(threading.get_ident(), None)
+        if not samples or seconds * 1000 < self.threshold_ms or self.dumps >= self.max_dumps:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        name = ''.join(ch if ch.isalnum() else '_' for ch in label).strip('_')
+        path = os.path.join(self.directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{self.dumps}-'
+                                            f'{int(seconds * 1000)}ms-{name}.folded')
+        try:
+            with open(path, 'w') as f:
+                for stack, count in samples.most_common():
+                    f.write(f'{stack} {count}\n')
+            self.dumps += 1
+        except OSError as e:
+            print(f"Error writing profile {path}: {str(e)}")
+
+    def discard(self):
+        with self._lock:
+            self._samples.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while self.enabled:
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[fold(frame)] += 1
+            time.sleep(self.interval)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'threshold_ms': self.threshold_ms,
+            'interval_ms': self.interval * 1000,
+            'dumps': self.dumps,
+            'directory': self.directory,
+        }
+
+
+def fold(frame):
+    """Root-first 'file:function;...' stack of a frame"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
@@ -0,0 +1,117 @@
+"""
+BIOLIT INTELLIGENCE - MOCK LLM SERVER (mock_llm_server.py)
+Local stand-in for Groq's OpenAI-compatible chat completions endpoint.
+
+Answers POST .../chat/completions with deterministic text built from the
+last user message, in plain JSON or as a server-sent-events stream. Latency
+and an error rate can be injected to exercise timeouts and retries.
+
+    python mock_llm_server.py --port 8081 --latency-ms 200
+    GROQ_API_KEY=test GROQ_BASE_URL=http://127.0.0.1:8081/v1 python app.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def mock_reply(messages):
+    prompt = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+    first_line = prompt.strip().splitlines()[0] if prompt.strip() else 'the request'
+    return (
+        f"# Mock response\n\n"
+        f"Generated offline for: {first_line[:200]}\n\n"
+        f"- Point one about the topic\n"
+        f"- Point two about the topic\n"
+        f"- Point three about the topic\n"
+    )
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    error_rate = 0.0
+    chunk_words = 4
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._send_json(404, {'error': {'message': 'Not found'}})
+
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            return self._send_json(503, {'error': {'message': 'Injected failure'}})
+
+        reply = mock_reply(request.get('messages', []))
+        model = request.get('model', 'mock')
+        if not request.get('stream'):
+            return self._send_json(200, {
+                'id': 'mock-completion',
+                'object': 'chat.completion',
+                'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': reply}}],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': len(reply.split())},
+            })
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        words = reply.split(' ')
+        for i in range(0, len(words), self.chunk_words):
+            delta = ' '.join(words[i:i + self.chunk_words]) + (' ' if i + self.chunk_words < len(words) else '')
+            chunk = {'object': 'chat.completion.chunk', 'model': model,
+                     'choices': [{'index': 0, 'delta': {'content': delta}}]}
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def start_mock_server(host='127.0.0.1', port=0, latency_ms=0, error_rate=0.0):
+    """Run the mock server in a daemon thread; returns (server, base_url)"""
+    handler = type('ConfiguredMockLLMHandler', (MockLLMHandler,), {
+        'latency': latency_ms / 1000.0,
+        'error_rate': error_rate,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-llm', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline stand-in for the Groq chat API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.host, args.port, args.latency_ms, args.error_rate)
+    print(f"Mock LLM server listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+BIOLIT INTELLIGENCE - NOTES CACHE (notes_cache.py)
+Persistent, content-addressed cache for generated study notes.
+
+Entries are keyed by a hash of the paper id, a hash of the paper content and
+the prompt/generator that produced them, so editing a paper or a prompt
+naturally misses. Entries are JSON files on local disk, evicted oldest-first
+once the directory grows past its size budget.
+
+Concurrent requests for the same key are coalesced (single-flight): within a
+process followers wait for the leader's result, and across gunicorn workers
+an advisory file lock makes the next worker find the leader's entry on disk.
+This holds for streamed generations too: the leader relays deltas as they
+arrive and followers receive the finished notes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process coalescing only
+    fcntl = None
+
+
+def content_version(paper):
+    """Stable hash of a paper's content"""
+    canonical = json.dumps(paper, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def notes_key(paper, *template_parts):
+    """Cache key from paper id, content version and everything that shapes the prompt"""
+    template_hash = hashlib.sha256('\x00'.join(map(str, template_parts)).encode('utf-8')).hexdigest()[:16]
+    raw = f"{paper['id']}:{content_version(paper)}:{template_hash}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class NotesCache:
+    """Disk cache with size-based eviction and single-flight generation"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+        self.generation_seconds = 0.0
+        self._flights = {}
+        self._evicting = False
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.enabled = True
+            self.total_bytes = sum(size for _, size, _ in self._scan())
+        except OSError as e:
+            print(f"Notes cache disabled ({directory}): {str(e)}")
+            self.enabled = False
+            self.total_bytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    @contextmanager
+    def _file_lock(self, key):
+        """Exclusive cross-process lock for one key; the lock file is removed on release"""
+        if fcntl is None or not self.enabled:
+            yield
+            return
+        lock_path = self._path(key)[:-len('.json')] + '.lock'
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        while True:
+            lock_file = open(lock_path, 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                current = os.fstat(lock_file.fileno()).st_ino == os.stat(lock_path).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                break
+            # The previous holder removed the file after we opened it; lock the new one
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+        try:
+            yield
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _scan(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)  # recency for eviction
+            return entry
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key, entry):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            size = os.path.getsize(tmp_path)
+            try:
+                # Overwriting an entry only adds the difference
+                size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Notes cache write failed: {str(e)}")
+            return
+        with self._lock:
+            self.total_bytes += size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under 90% of the budget.
+
+        The directory is scanned without holding the lock, so lookups and
+        writes carry on meanwhile; one eviction runs at a time per process.
+        """
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+        try:
+            entries = sorted(self._scan(), key=lambda item: item[2])
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            evicted = 0
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+            with self._lock:
+                self.evictions += evicted
+                self.total_bytes = total
+        finally:
+            with self._lock:
+                self._evicting = False
+
+    def _count_hit(self, entry):
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += entry.get('generation_seconds', 0.0)
+
+    def lookup(self, key):
+        """get() that counts a hit and the generation time it saved"""
+        entry = self.get(key)
+        if entry is not None:
+            self._count_hit(entry)
+        return entry
+
+    def _store(self, key, notes, generation_seconds):
+        """Write newly generated notes and count the miss"""
+        entry = {'notes': notes, 'generation_seconds': generation_seconds, 'created': time.time()}
+        with self._lock:
+            self.misses += 1
+            self.generation_seconds += generation_seconds
+        self.put(key, entry)
+        return entry
+
+    def _board(self, key):
+        """(flight, leader): join the in-process generation of `key` or start one"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _land(self, key, flight):
+        flight.done.set()
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _follow(self, flight):
+        """The leader's entry, or None if the leader stopped without one (client went away)"""
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        if flight.entry is not None:
+            with self._lock:
+                self.coalesced += 1
+                self.saved_seconds += flight.entry.get('generation_seconds', 0.0)
+        return flight.entry
+
+    def get_or_generate(self, key, generate):
+        """Return (entry, cached); `generate` runs at most once per key at a time"""
+        while True:
+            entry = self.lookup(key)
+            if entry is not None:
+                return entry, True
+            flight, leader = self._board(key)
+            if leader:
+                break
+            entry = self._follow(flight)
+            if entry is not None:
+                return entry, True
+
+        try:
+            with self._file_lock(key):
+                entry = self.get(key)
+                if entry is not None:
+                    # Another worker generated it while we waited for the lock
+                    self._count_hit(entry)
+                    flight.entry = entry
+                    return entry, True
+                started = time.perf_counter()
+                notes = generate()
+                flight.entry = self._store(key, notes, time.perf_counter() - started)
+                return flight.entry, False
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight)
+
+    def stream_or_get(self, key, stream):
+        """Yield (delta, cached) pairs of a key's notes, streaming a new generation.
+
+        Same single-flight rules as get_or_generate: cached notes, or those of
+        a concurrent generation, come back as one delta. Otherwise `stream()`
+        is consumed under the cross-process lock, its deltas are passed on as
+        they arrive and the joined notes are stored.
+        """
+        while True:
+            entry = self.lookup(key)
+            if entry is not None:
+                yield entry['notes'], True
+                return
+            flight, leader = self._board(key)
+            if leader:
+                break
+            entry = self._follow(flight)
+            if entry is not None:
+                yield entry['notes'], True
+                return
+
+        try:
+            with self._file_lock(key):
+                entry = self.get(key)
+                if entry is not None:
+                    self._count_hit(entry)
+                    flight.entry = entry
+                    yield entry['notes'], True
+                    return
+                started = time.perf_counter()
+                parts = []
+                for delta in stream():
+                    parts.append(delta)
+                    yield delta, False
+                flight.entry = self._store(key, ''.join(parts), time.perf_counter() - started)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            # Closed early (client disconnected): followers retry on their own
+            self._land(key, flight)
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'enabled': self.enabled,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'generation_seconds': round(self.generation_seconds, 3),
+            'saved_generation_seconds': round(self.saved_seconds, 3),
+        }
@@ -0,0 +1,119 @@
+"""
+BIOLIT INTELLIGENCE - PAPER EXPORT (paper_export.py)
+Cursor-based paging and streaming serializers for /api/papers.
+
+Cursors are opaque, URL-safe tokens holding the next store row, so a page
+is read straight from the store without materializing the corpus. The
+NDJSON, CSV and BibTeX exporters are generators that yield one record at a
+time, keeping memory constant however many papers are exported.
+"""
+
+import base64
+import csv
+import io
+import json
+
+from paper_store import iter_live
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'bibtex': 'application/x-bibtex',
+}
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(row):
+    raw = json.dumps({'row': row}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        row = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))['row']
+    except (ValueError, KeyError, TypeError):
+        raise CursorError('Invalid cursor')
+    if not isinstance(row, int) or row < 0:
+        raise CursorError('Invalid cursor')
+    return row
+
+
+def parse_fields(fields_param, known_fields):
+    """Validate a comma-separated projection; None means all fields"""
+    if not fields_param:
+        return None
+    fields = [f.strip() for f in fields_param.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in known_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project(paper, fields):
+    if fields is None:
+        return paper
+    return {field: paper.get(field) for field in fields}
+
+
+def iter_papers(store, start=0):
+    """Yield (row, paper) from `start`, skipping rows superseded by re-ingestion"""
+    return iter_live(store, start)
+
+
+def read_page(store, start, limit):
+    """One page of (row, paper) pairs and the cursor of the next page (None at the end)"""
+    page = []
+    for row, paper in iter_papers(store, start):
+        if len(page) == limit:
+            return page, encode_cursor(row)
+        page.append((row, paper))
+    return page, None
+
+
+def ndjson_lines(papers, fields):
+    for paper in papers:
+        yield json.dumps(project(paper, fields), ensure_ascii=False) + '\n'
+
+
+def csv_lines(papers, fields, default_fields):
+    columns = fields or list(default_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for paper in papers:
+        writer.writerow([
+            '; '.join(map(str, value)) if isinstance(value, list) else value
+            for value in (paper.get(column) for column in columns)
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there were no papers
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def bibtex_entry(paper):
+    authors = paper.get('authors') or []
+    surname = authors[0].split(',')[0].split()[-1] if authors else 'anon'
+    key = f"{''.join(ch for ch in surname if ch.isalnum())}{paper.get('year', '')}_{paper['id']}"
+    lines = [
+        ('title', paper.get('title')),
+        ('author', ' and '.join(authors)),
+        ('journal', paper.get('journal')),
+        ('year', paper.get('year')),
+        ('keywords', ', '.join(paper.get('keywords') or [])),
+    ]
+    body = ',\n'.join(f'  {name} = {{{value}}}' for name, value in lines if value not in (None, ''))
+    return f'@article{{{key},\n{body}\n}}\n\n'
+
+
+def bibtex_lines(papers):
+    for paper in papers:
+        yield bibtex_entry(paper)
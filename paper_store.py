@@ -0,0 +1,335 @@
+"""
+BIOLIT INTELLIGENCE - PAPER STORE (paper_store.py)
+Pluggable storage layer for the paper corpus.
+
+Two backends share the same interface (len, iteration, row(), column(), get(), append()),
+and both resolve paper ids through an IdIndex built at load time and kept up
+to date as rows are appended. Re-ingesting an id supersedes its older row;
+the IdIndex records those rows (rebuilt from the id column on load, so they
+survive restarts) and iter_live() skips them:
+- MemoryPaperStore: numeric column arrays plus slotted, interned Paper
+  records (see records.py); serves the built-in mock corpus
+- MmapPaperStore: on-disk columnar store; numeric fields live in fixed-width
+  column files and text fields in an offset-indexed blob, all memory-mapped
+  so every gunicorn worker shares the same page cache instead of holding its
+  own copy of the corpus. All other (variable-length) fields are stored as
+  one JSON document per row in the blob.
+
+Build a store from a JSON list of papers with:
+    python paper_store.py build papers.json data/paper_store
+"""
+
+import argparse
+import json
+import mmap
+import os
+from array import array
+
+from records import PaperCodec
+
+# Numeric columns: field name -> array typecode
+NUMERIC_COLUMNS = {
+    'id': 'q',
+    'year': 'h',
+    'citations': 'i',
+    'impact_factor': 'f',
+    'h_index': 'i',
+}
+
+# In memory, impact factors keep full precision
+MEMORY_COLUMNS = {**NUMERIC_COLUMNS, 'impact_factor': 'd'}
+
+# Field order of materialized records (matches PAPERS_DB)
+FIELD_ORDER = ('id', 'title', 'authors', 'year', 'journal', 'citations',
+               'impact_factor', 'abstract', 'keywords', 'h_index', 'references')
+
+META_FILE = 'meta.json'
+BLOB_FILE = 'text.bin'
+OFFSETS_FILE = 'text.off'
+STORE_VERSION = 1
+
+
+class IdIndex:
+    """O(1) paper id -> row mapping shared by every ID-based lookup"""
+
+    def __init__(self, pairs=()):
+        self._rows = {}
+        # Rows whose id was re-ingested at a later row
+        self.superseded = set()
+        for paper_id, row in pairs:
+            self.add(paper_id, row)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, paper_id):
+        return paper_id in self._rows
+
+    def add(self, paper_id, row):
+        """Point paper_id at row; returns the row this supersedes, if any"""
+        # Re-ingesting an id points it at the newest row
+        old_row = self._rows.get(paper_id)
+        self._rows[paper_id] = row
+        if old_row is not None and old_row != row:
+            self.superseded.add(old_row)
+            return old_row
+        return None
+
+    def row_of(self, paper_id):
+        return self._rows.get(paper_id)
+
+
+class MemoryPaperStore:
+    """Paper store backed by in-process numeric columns and compact Paper records"""
+
+    def __init__(self, papers=()):
+        self.codec = PaperCodec()
+        self._columns = {name: array(typecode) for name, typecode in MEMORY_COLUMNS.items()}
+        self._records = []
+        self.id_index = IdIndex()
+        self.append(papers)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        for row in range(len(self._records)):
+            yield self.row(row)
+
+    def column(self, name):
+        """Numeric column as a typed array (do not modify)"""
+        return self._columns[name]
+
+    def record(self, row):
+        """The compact Paper record of a row (variable-length fields only)"""
+        return self._records[row]
+
+    def row(self, row):
+        if not 0 <= row < len(self._records):
+            raise IndexError(row)
+        numeric = {name: column[row] for name, column in self._columns.items()}
+        return self.codec.decode(self._records[row], numeric)
+
+    def row_of(self, paper_id):
+        return self.id_index.row_of(paper_id)
+
+    def is_live(self, row):
+        return row not in self.id_index.superseded
+
+    def get(self, paper_id):
+        row = self.id_index.row_of(paper_id)
+        return self.row(row) if row is not None else None
+
+    def refresh(self):
+        """Rows only arrive through append(), so there is nothing to pick up"""
+        return set()
+
+    def append(self, papers):
+        """Append papers and return the rows they were stored at"""
+        start = len(self._records)
+        for paper in papers:
+            for name, column in self._columns.items():
+                column.append(paper.get(name) or 0)
+            self._records.append(self.codec.encode(paper, FIELD_ORDER))
+            self.id_index.add(paper['id'], len(self._records) - 1)
+        return range(start, len(self._records))
+
+
+class MmapPaperStore:
+    """Read-mostly columnar paper store backed by memory-mapped files"""
+
+    def __init__(self, directory, index_ids=True):
+        self.directory = directory
+        # Append-only writers (ingest.py) skip the id index, keeping their
+        # memory flat; row_of() then finds nothing and every row reads as live
+        self.index_ids = index_ids
+        self._maps = []
+        self._columns = {}
+        self._offsets = None
+        self._blob = None
+        self.count = 0
+        self.id_index = IdIndex()
+        self._indexed_rows = 0
+        self.refresh()
+
+    @classmethod
+    def create(cls, directory, **kwargs):
+        """Create an empty store in directory (existing files are truncated)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in NUMERIC_COLUMNS:
+            open(cls._column_path(directory, name), 'wb').close()
+        open(os.path.join(directory, BLOB_FILE), 'wb').close()
+        with open(os.path.join(directory, OFFSETS_FILE), 'wb') as f:
+            array('Q', [0]).tofile(f)
+        cls._write_meta(directory, 0)
+        return cls(directory, **kwargs)
+
+    @staticmethod
+    def exists(directory):
+        return bool(directory) and os.path.exists(os.path.join(directory, META_FILE))
+
+    @staticmethod
+    def _column_path(directory, name):
+        return os.path.join(directory, f'{name}.{NUMERIC_COLUMNS[name]}col')
+
+    @staticmethod
+    def _write_meta(directory, count):
+        tmp_path = os.path.join(directory, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': STORE_VERSION, 'count': count}, f)
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+    def _map(self, path, typecode=None):
+        if os.path.getsize(path) == 0:
+            return memoryview(b'').cast(typecode) if typecode else memoryview(b'')
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        view = memoryview(mapped)
+        return view.cast(typecode) if typecode else view
+
+    def refresh(self):
+        """(Re)map the files, picking up rows appended by another process.
+
+        Returns the rows superseded by the newly indexed ones. Readers in
+        other threads keep working: the new mappings replace the old ones
+        in one step.
+        """
+        with open(os.path.join(self.directory, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported paper store version: {meta.get('version')}")
+        if self._columns and meta['count'] == self.count:
+            return set()
+
+        old_maps, self._maps = self._maps, []
+        columns = {name: self._map(self._column_path(self.directory, name), typecode)
+                   for name, typecode in NUMERIC_COLUMNS.items()}
+        offsets = self._map(os.path.join(self.directory, OFFSETS_FILE), 'Q')
+        blob = self._map(os.path.join(self.directory, BLOB_FILE))
+        self._columns, self._offsets, self._blob = columns, offsets, blob
+        self.count = meta['count']
+        self._close_maps(old_maps)
+
+        # Index only the rows appended since the last refresh
+        superseded = set()
+        if self.index_ids:
+            ids = self._columns['id']
+            for row in range(self._indexed_rows, self.count):
+                old_row = self.id_index.add(ids[row], row)
+                if old_row is not None:
+                    superseded.add(old_row)
+            self._indexed_rows = self.count
+        return superseded
+
+    def close(self):
+        self._columns = {}
+        self._offsets = None
+        self._blob = None
+        self._close_maps(self._maps)
+        self._maps = []
+
+    @staticmethod
+    def _close_maps(maps):
+        for mapped in maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller still holds a view into the old mapping
+                pass
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self.row(row)
+
+    def column(self, name):
+        """Zero-copy view of a numeric column"""
+        return self._columns[name][:self.count]
+
+    def row(self, row):
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        start, end = self._offsets[row], self._offsets[row + 1]
+        values = {name: column[row] for name, column in self._columns.items()}
+        # float32 storage: round back to the precision impact factors are quoted in
+        values['impact_factor'] = round(values['impact_factor'], 2)
+        values.update(json.loads(bytes(self._blob[start:end])))
+        record = {field: values.pop(field) for field in FIELD_ORDER if field in values}
+        record.update(values)
+        return record
+
+    def row_of(self, paper_id):
+        return self.id_index.row_of(paper_id)
+
+    def is_live(self, row):
+        return row not in self.id_index.superseded
+
+    def get(self, paper_id):
+        row = self.id_index.row_of(paper_id)
+        return self.row(row) if row is not None else None
+
+    def append(self, papers):
+        """Append papers to the column files and return their rows"""
+        papers = list(papers)
+        if not papers:
+            return range(self.count, self.count)
+
+        for name, typecode in NUMERIC_COLUMNS.items():
+            values = array(typecode, (p.get(name) or 0 for p in papers))
+            with open(self._column_path(self.directory, name), 'ab') as f:
+                values.tofile(f)
+
+        blob_path = os.path.join(self.directory, BLOB_FILE)
+        offset = os.path.getsize(blob_path)
+        offsets = array('Q')
+        with open(blob_path, 'ab') as f:
+            for paper in papers:
+                text = {k: v for k, v in paper.items() if k not in NUMERIC_COLUMNS}
+                encoded = json.dumps(text, separators=(',', ':')).encode('utf-8')
+                f.write(encoded)
+                offset += len(encoded)
+                offsets.append(offset)
+        with open(os.path.join(self.directory, OFFSETS_FILE), 'ab') as f:
+            offsets.tofile(f)
+
+        start = self.count
+        self._write_meta(self.directory, start + len(papers))
+        self.refresh()
+        return range(start, self.count)
+
+
+def iter_live(store, start=0):
+    """Yield (row, paper) from `start`, skipping rows superseded by re-ingestion"""
+    for row in range(start, len(store)):
+        if store.is_live(row):
+            yield row, store.row(row)
+
+
+def open_paper_store(directory, fallback_papers):
+    """Open the on-disk store if one exists, else serve fallback_papers from memory"""
+    if MmapPaperStore.exists(directory):
+        return MmapPaperStore(directory)
+    return MemoryPaperStore(fallback_papers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BioLit paper store tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Build a store from a JSON list of papers')
+    build.add_argument('source', help='JSON file containing a list of paper records')
+    build.add_argument('directory', help='Output store directory')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with open(args.source) as f:
+            papers = json.load(f)
+        store = MmapPaperStore.create(args.directory)
+        store.append(papers)
+        print(f"Wrote {len(store)} papers to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+BIOLIT INTELLIGENCE - RANGE INDEX (range_index.py)
+Sorted secondary indexes over numeric paper columns (year, citations).
+
+Rows are kept ordered by value, so the rows in a value range are one
+searchsorted slice, and a filter costs time proportional to the rows it
+matches rather than to the corpus. Rows appended after the last build sit
+in a small pending list that is merged once it grows past a fraction of the
+index.
+"""
+
+import threading
+
+import numpy as np
+
+
+class SortedColumnIndex:
+    """Rows ordered by one numeric column, for range lookups"""
+
+    def __init__(self, values=(), rows=None):
+        values = np.asarray(values, dtype=np.int64)
+        rows = np.arange(len(values), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        order = np.argsort(values, kind='stable')
+        self.values = values[order]
+        self.rows = rows[order]
+        self._pending = ([], [])
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store, name):
+        """Index the live rows of a store's column (superseded rows are left out)"""
+        values = np.array(store.column(name), dtype=np.int64)
+        rows = np.arange(len(values), dtype=np.int64)
+        if store.id_index.superseded:
+            live = np.ones(len(values), dtype=bool)
+            live[np.fromiter(store.id_index.superseded, dtype=np.int64)] = False
+            values, rows = values[live], rows[live]
+        return cls(values, rows)
+
+    def __len__(self):
+        return len(self.rows) + len(self._pending[1])
+
+    def add(self, row, value):
+        with self._lock:
+            pending_values, pending_rows = self._pending
+            pending_values.append(int(value))
+            pending_rows.append(row)
+            if len(pending_rows) > max(1024, len(self.rows) // 8):
+                self._merge()
+
+    def _merge(self):
+        pending_values, pending_rows = self._pending
+        values = np.concatenate([self.values, np.array(pending_values, dtype=np.int64)])
+        rows = np.concatenate([self.rows, np.array(pending_rows, dtype=np.int64)])
+        order = np.argsort(values, kind='stable')
+        self.values, self.rows = values[order], rows[order]
+        self._pending = ([], [])
+
+    def between(self, low=None, high=None):
+        """Rows with low <= value <= high (either bound optional), in row order"""
+        with self._lock:
+            values, rows = self.values, self.rows
+            pending_values, pending_rows = self._pending
+            lo = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+            hi = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+            matched = rows[lo:max(lo, hi)]
+            extra = [row for value, row in zip(pending_values, pending_rows)
+                     if (low is None or value >= low) and (high is None or value <= high)]
+        if extra:
+            matched = np.concatenate([matched, np.array(extra, dtype=np.int64)])
+        return np.sort(matched)
+
+    def count_between(self, low=None, high=None):
+        with self._lock:
+            values = self.values
+            lo = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+            hi = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+            extra = sum(1 for value in self._pending[0]
+                        if (low is None or value >= low) and (high is None or value <= high))
+        return max(0, hi - lo) + extra
@@ -0,0 +1,263 @@
+"""
+BIOLIT INTELLIGENCE - RECOMMENDER (recommender.py)
+Keyword-similarity recommendations over a sparse paper x keyword matrix.
+
+The incidence matrix is kept in CSR form (paper -> keyword columns) together
+with its transpose (keyword -> paper rows), so the shared-keyword counts of a
+paper against every candidate are computed in one batched NumPy pass over the
+postings of its keywords rather than with per-pair Python set intersections.
+
+RecommendationCache keeps the top-k of every paper precomputed by a
+background thread and recomputes only the rows affected by ingestion.
+"""
+
+import threading
+
+import numpy as np
+
+from citation_graph import gather
+
+
+class KeywordMatrix:
+    """Sparse paper x keyword incidence matrix with batched similarity queries"""
+
+    def __init__(self):
+        self.vocab = {}
+        self.keywords = []
+        # CSR (rows = papers); rows appended since the last build are pending
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self._pending = []
+        # Row -> replacement columns from set_keywords, applied by the next build
+        self._replaced = {}
+        # Transpose (rows = keywords), rebuilt lazily after appends
+        self._kw_indptr = np.zeros(1, dtype=np.int64)
+        self._kw_indices = np.zeros(0, dtype=np.int32)
+        self._row_lengths = np.zeros(0, dtype=np.int64)
+        self._dirty = False
+        # Serializes lazy rebuilds against queries from request and cache threads
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_store(cls, store):
+        matrix = cls()
+        for row in range(len(store)):
+            # Superseded rows stay as empty rows so row numbers line up with the store
+            matrix.add(row, store.row(row)['keywords'] if store.is_live(row) else ())
+        return matrix
+
+    @property
+    def row_count(self):
+        return len(self.indptr) - 1 + len(self._pending)
+
+    def _column(self, keyword):
+        column = self.vocab.get(keyword)
+        if column is None:
+            column = self.vocab[keyword] = len(self.keywords)
+            self.keywords.append(keyword)
+        return column
+
+    def add(self, row, keywords):
+        """Append a paper's keywords; rows must be added in order"""
+        with self._lock:
+            if row != self.row_count:
+                raise ValueError(f'Expected row {self.row_count}, got {row}')
+            self._pending.append(sorted({self._column(k) for k in keywords}))
+            self._dirty = True
+
+    def _build(self):
+        # Callers hold self._lock
+        if not self._dirty:
+            return
+        if self._pending:
+            lengths = np.fromiter((len(cols) for cols in self._pending), dtype=np.int64,
+                                  count=len(self._pending))
+            new_indices = np.fromiter((c for cols in self._pending for c in cols),
+                                      dtype=np.int32, count=int(lengths.sum()))
+            self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lengths)])
+            self.indices = np.concatenate([self.indices, new_indices])
+            self._pending = []
+        if self._replaced:
+            self._apply_replacements()
+
+        # Transpose: stable sort of (keyword, paper) pairs by keyword
+        rows = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        self._kw_indices = rows[order]
+        counts = np.bincount(self.indices, minlength=len(self.keywords))
+        self._kw_indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._row_lengths = np.diff(self.indptr)
+        self._dirty = False
+
+    def _apply_replacements(self):
+        """Rebuild the CSR with every buffered set_keywords() in one pass"""
+        row_count = len(self.indptr) - 1
+        replaced = np.fromiter(self._replaced, dtype=np.int64, count=len(self._replaced))
+        rows = np.repeat(np.arange(row_count, dtype=np.int64), np.diff(self.indptr))
+        keep = ~np.isin(rows, replaced)
+        lengths = [len(self._replaced[row]) for row in replaced.tolist()]
+        new_rows = np.repeat(replaced, lengths)
+        new_indices = np.fromiter((c for row in replaced.tolist() for c in self._replaced[row]),
+                                  dtype=np.int32, count=len(new_rows))
+        # Stable sort by row keeps each row's columns in their sorted order
+        all_rows = np.concatenate([rows[keep], new_rows])
+        order = np.argsort(all_rows, kind='stable')
+        self.indices = np.concatenate([self.indices[keep], new_indices])[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(all_rows, minlength=row_count))]).astype(np.int64)
+        self._replaced = {}
+
+    def set_keywords(self, row, keywords):
+        """Replace the keywords of an existing row (an empty list removes it from results).
+
+        Replacements are buffered and applied together by the next query, so
+        superseding a batch of rows rebuilds the CSR once rather than per row.
+        """
+        with self._lock:
+            if not 0 <= row < self.row_count:
+                raise IndexError(row)
+            self._replaced[row] = sorted({self._column(k) for k in keywords})
+            self._dirty = True
+
+    def neighbors_many(self, rows):
+        """Rows sharing at least one keyword with any of `rows` (including them)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        with self._lock:
+            self._build()
+            columns = np.unique(gather(self.indptr, self.indices, rows)).astype(np.int64)
+            return np.union1d(gather(self._kw_indptr, self._kw_indices, columns), rows)
+
+    def row_keywords(self, row):
+        with self._lock:
+            self._build()
+            return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def similar(self, row, limit=8):
+        """Rank every paper sharing a keyword with `row`.
+
+        connection_strength = shared / max(len(a), len(b)) * 100, computed for
+        all candidates at once. Returns (match_count, [(row, strength), ...])
+        with the top `limit` candidates in descending strength.
+        """
+        with self._lock:
+            columns = self.row_keywords(row)
+            if not len(columns):
+                return 0, []
+            postings = [self._kw_indices[self._kw_indptr[c]:self._kw_indptr[c + 1]] for c in columns]
+            row_lengths = self._row_lengths
+
+        candidates, shared = np.unique(np.concatenate(postings), return_counts=True)
+        keep = candidates != row
+        candidates, shared = candidates[keep], shared[keep]
+        if not len(candidates):
+            return 0, []
+
+        strength = shared / np.maximum(len(columns), row_lengths[candidates]) * 100
+
+        if len(candidates) > limit:
+            top = np.argpartition(-strength, limit - 1)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        # Descending strength, ties broken by row order
+        top = top[np.lexsort((candidates[top], -strength[top]))]
+        return len(candidates), [(int(candidates[i]), float(strength[i])) for i in top]
+
+
+class RecommendationCache:
+    """Versioned top-k recommendations per row, precomputed in the background.
+
+    Entries hold (count, rows, strengths) as compact NumPy arrays. When rows
+    are invalidated they are queued for recomputation; a result computed
+    before a newer invalidation of the same row is discarded. The warm-up
+    walks the rows with a cursor, so only invalidated rows get a version.
+    """
+
+    def __init__(self, matrix, limit=8):
+        self.matrix = matrix
+        self.limit = limit
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._row_versions = {}
+        self._stale = set()
+        # Warm-up cursor: rows [_warm_next, _warm_end) are still to be computed
+        self._warm_next = 0
+        self._warm_end = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def get(self, row):
+        """Cached (count, [(row, strength), ...]) or None on a miss"""
+        entry = self._entries.get(row)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        count, rows, strengths = entry
+        return count, list(zip(rows.tolist(), strengths.tolist()))
+
+    def compute(self, row):
+        """Compute the top-k for `row` and store it unless it went stale meanwhile"""
+        with self._lock:
+            version = self.version
+        count, ranked = self.matrix.similar(row, self.limit)
+        with self._lock:
+            if self._row_versions.get(row, 0) <= version:
+                self._entries[row] = (
+                    count,
+                    np.array([r for r, _ in ranked], dtype=np.int32),
+                    np.array([s for _, s in ranked], dtype=np.float32),
+                )
+                self._stale.discard(row)
+        return count, ranked
+
+    def invalidate(self, rows):
+        """Drop the cached top-k of `rows` and queue them for recomputation"""
+        with self._lock:
+            self.version += 1
+            for row in rows:
+                row = int(row)
+                self._row_versions[row] = self.version
+                self._entries.pop(row, None)
+                self._stale.add(row)
+        self._wakeup.set()
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'entries': len(self._entries),
+            'stale': len(self._stale),
+            'warming': self._warm_end - self._warm_next,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def start(self):
+        """Start the background job: warm every row, then refresh stale rows"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            self._warm_next, self._warm_end = 0, self.matrix.row_count
+        self._wakeup.set()
+        self._thread = threading.Thread(target=self._run, name='recommendation-cache', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                with self._lock:
+                    if self._stale:
+                        # Invalidated rows go first: their entries were dropped
+                        row = self._stale.pop()
+                    elif self._warm_next < self._warm_end:
+                        row = self._warm_next
+                        self._warm_next += 1
+                        if row in self._entries:
+                            continue
+                    else:
+                        break
+                if row < self.matrix.row_count:
+                    self.compute(row)
@@ -0,0 +1,124 @@
+"""
+BIOLIT INTELLIGENCE - COMPACT RECORDS (records.py)
+Slotted, interned in-memory records for papers and curated author metadata.
+
+A paper dict costs a hash table plus a separate list and string object for
+every author and keyword. Here:
+- author names, keywords and journals are interned once in a Vocabulary and
+  stored per paper as arrays of integer ids
+- numeric fields live in typed column arrays owned by the store (the same
+  layout as the on-disk MmapPaperStore), so a Paper only holds the
+  variable-length fields
+- Paper and Author use __slots__, so they have no per-instance __dict__
+
+Dicts are only materialized by PaperCodec.decode, at the serialization edge.
+"""
+
+from array import array
+
+# Fields held by Paper; everything else in FIELD_ORDER is a numeric column
+PAPER_SLOTS = ('title', 'author_ids', 'journal_id', 'abstract', 'keyword_ids', 'references', 'extra')
+
+
+class Vocabulary:
+    """Interned strings <-> dense integer ids"""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def id(self, value):
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def encode(self, values):
+        return array('I', map(self.id, values))
+
+    def decode(self, ids):
+        values = self.values
+        return [values[value_id] for value_id in ids]
+
+
+class Paper:
+    """Variable-length fields of one stored paper"""
+
+    __slots__ = PAPER_SLOTS
+
+    def __init__(self, title, author_ids, journal_id, abstract, keyword_ids, references, extra=None):
+        self.title = title
+        self.author_ids = author_ids
+        self.journal_id = journal_id
+        self.abstract = abstract
+        self.keyword_ids = keyword_ids
+        self.references = references
+        # Fields outside the paper schema, kept as given (rare)
+        self.extra = extra
+
+
+class PaperCodec:
+    """Converts paper dicts to Paper records and back, sharing the vocabularies"""
+
+    def __init__(self):
+        self.authors = Vocabulary()
+        self.keywords = Vocabulary()
+        self.journals = Vocabulary()
+
+    def encode(self, paper, known_fields):
+        extra = {k: v for k, v in paper.items() if k not in known_fields}
+        return Paper(
+            title=paper.get('title', ''),
+            author_ids=self.authors.encode(paper.get('authors') or ()),
+            journal_id=self.journals.id(paper.get('journal') or ''),
+            abstract=paper.get('abstract', ''),
+            keyword_ids=self.keywords.encode(paper.get('keywords') or ()),
+            references=array('q', paper.get('references') or ()),
+            extra=extra or None,
+        )
+
+    def decode(self, record, numeric):
+        """Paper dict in FIELD_ORDER from a record and its numeric column values"""
+        paper = {
+            'id': numeric['id'],
+            'title': record.title,
+            'authors': self.authors.decode(record.author_ids),
+            'year': numeric['year'],
+            'journal': self.journals.values[record.journal_id],
+            'citations': numeric['citations'],
+            'impact_factor': numeric['impact_factor'],
+            'abstract': record.abstract,
+            'keywords': self.keywords.decode(record.keyword_ids),
+            'h_index': numeric['h_index'],
+            'references': record.references.tolist(),
+        }
+        if record.extra:
+            paper.update(record.extra)
+        return paper
+
+    def stats(self):
+        return {'authors': len(self.authors), 'keywords': len(self.keywords), 'journals': len(self.journals)}
+
+
+class Author:
+    """Curated metadata for one author (fields the corpus cannot provide)"""
+
+    __slots__ = ('name', 'h_index', 'publications', 'citations', 'field', 'institution')
+
+    def __init__(self, name, h_index=None, publications=None, citations=None, field=None, institution=None):
+        self.name = name
+        self.h_index = h_index
+        self.publications = publications
+        self.citations = citations
+        self.field = field
+        self.institution = institution
+
+    @classmethod
+    def from_dict(cls, name, info):
+        return cls(name, **{slot: info.get(slot) for slot in cls.__slots__[1:]})
@@ -0,0 +1,233 @@
+"""
+BIOLIT INTELLIGENCE - RESPONSE CACHE (response_cache.py)
+Response caching for read-heavy endpoints.
+
+Successful responses are cached under a key built from the route and a
+set of request fields (query, year, sort_by, ...), with a TTL and
+size-bounded LRU eviction. Only free-text fields are normalized for the
+key; opaque tokens such as cursors are used verbatim. Every cached body carries an ETag so clients
+sending If-None-Match get a 304 without the body being re-sent. Per-request
+fields such as the response time are left out of the cached body and added
+to each response after the lookup, so hits report their own timing.
+
+Backends:
+- MemoryCacheBackend: per-process OrderedDict LRU (default)
+- RedisCacheBackend: shared across gunicorn workers; eviction is left to the
+  server's maxmemory-policy (use allkeys-lru). Any client object exposing
+  get/set/incr works, so a local stand-in can replace a real Redis server.
+  Entries are stored as a JSON header line followed by the raw body, never
+  pickled, so writing to Redis does not grant code execution in the app.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, make_response, request
+
+from metrics import request_elapsed_ms
+
+
+class MemoryCacheBackend:
+    """Thread-safe LRU with per-entry expiry"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self):
+        return self._generation
+
+    def bump_generation(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers through a Redis(-compatible) client"""
+
+    def __init__(self, url=None, client=None, prefix='biolit:response:'):
+        if client is None:
+            import redis  # optional dependency, only needed for the shared backend
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return decode_entry(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, encode_entry(value), ex=max(1, int(ttl)))
+
+    def generation(self):
+        return int(self.client.get(self.prefix + 'generation') or 0)
+
+    def bump_generation(self):
+        # Old entries become unreachable and expire through their TTL
+        self.client.incr(self.prefix + 'generation')
+
+    def __len__(self):
+        return 0
+
+
+def encode_entry(entry):
+    """(body, mimetype, etag) as a JSON header line followed by the raw body"""
+    body, mimetype, etag = entry
+    header = json.dumps({'mimetype': mimetype, 'etag': etag}, separators=(',', ':'))
+    return header.encode('utf-8') + b'\n' + body
+
+
+def decode_entry(raw):
+    """Inverse of encode_entry; malformed values are treated as a miss"""
+    header, separator, body = bytes(raw).partition(b'\n')
+    try:
+        meta = json.loads(header)
+        return body, meta['mimetype'], meta['etag']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def with_elapsed(body, field):
+    """A JSON object body with `field` set to this request's elapsed milliseconds"""
+    body = body.rstrip()
+    value = json.dumps(request_elapsed_ms()).encode('utf-8')
+    member = b'"' + field.encode('utf-8') + b'":' + value
+    if body == b'{}':
+        return b'{' + member + b'}'
+    return body[:-1] + b',' + member + b'}'
+
+
+def normalize_text(value):
+    """Case- and whitespace-insensitive form of a free-text field for cache keys.
+
+    Lists are normalized per entry; in dict entries (batch searches) only
+    the 'query' text is, other members are kept verbatim.
+    """
+    if isinstance(value, str):
+        return ' '.join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return [normalize_text(v) for v in value]
+    if isinstance(value, dict):
+        return {k: normalize_text(v) if k == 'query' else v for k, v in value.items()}
+    return value
+
+
+class ResponseCache:
+    """Caches successful JSON responses and answers conditional requests"""
+
+    def __init__(self, backend, ttl=300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def make_key(self, fields, view_args, text_fields=()):
+        data = request.get_json(silent=True) if request.is_json else None
+        data = data if isinstance(data, dict) else {}
+        values = {}
+        for field in fields:
+            value = data.get(field, request.args.get(field))
+            if value not in (None, ''):
+                values[field] = normalize_text(value) if field in text_fields else value
+        payload = json.dumps({
+            'generation': self.backend.generation(),
+            'method': request.method,
+            'path': request.path,
+            'view_args': view_args,
+            'fields': values,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def cached(self, *fields, text=(), ttl=None, elapsed=None):
+        """Decorator caching a view's 200 responses, keyed on `fields`.
+
+        Fields named in `text` are free text the view treats case- and
+        whitespace-insensitively, and are normalized in the key. `elapsed`
+        names a JSON field filled with the request's elapsed milliseconds
+        after the lookup; the view leaves it out of its body.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method == 'OPTIONS':
+                    return view(*args, **kwargs)
+
+                key = self.make_key(fields, kwargs, text)
+                entry = self.backend.get(key)
+                if entry is None:
+                    self.misses += 1
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    body = response.get_data()
+                    etag = hashlib.sha1(body).hexdigest()
+                    entry = (body, response.mimetype, etag)
+                    self.backend.set(key, entry, ttl or self.ttl)
+                    cache_status = 'MISS'
+                else:
+                    self.hits += 1
+                    cache_status = 'HIT'
+
+                body, mimetype, etag = entry
+                # Bodies differing only in their timing field share a weak ETag
+                weak = elapsed is not None
+                if request.if_none_match.contains_weak(etag) if weak else request.if_none_match.contains(etag):
+                    self.not_modified += 1
+                    response = Response(status=304)
+                else:
+                    response = Response(with_elapsed(body, elapsed) if elapsed else body,
+                                        status=200, mimetype=mimetype)
+                response.set_etag(etag, weak=weak)
+                response.headers['X-Cache'] = cache_status
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self):
+        """Drop every cached response (e.g. after ingesting papers)"""
+        self.backend.bump_generation()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'not_modified': self.not_modified,
+            'evictions': self.backend.evictions,
+        }
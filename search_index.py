@@ -0,0 +1,259 @@
+"""
+BIOLIT INTELLIGENCE - SEARCH INDEX (search_index.py)
+Tokenized inverted index with BM25F scoring for the search endpoint.
+
+Postings are kept per field (title, keywords, abstract) so a query only
+touches the documents that contain its terms instead of scanning the corpus.
+"""
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from paper_store import iter_live
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field boosts replace the old fixed 50/30/20 title/keyword/abstract weights
+FIELD_WEIGHTS = {
+    'title': 2.5,
+    'keywords': 2.0,
+    'abstract': 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Postings lists kept as numpy arrays for filtered queries (LRU, per field and term)
+POSTING_CACHE_TERMS = 4096
+
+
+def tokenize(text):
+    """Lowercase and split text into alphanumeric terms"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def paper_fields(paper):
+    """Return the searchable text of a paper, keyed by field name"""
+    return {
+        'title': paper['title'],
+        'keywords': ' '.join(paper['keywords']),
+        'abstract': paper['abstract'],
+    }
+
+
+class InvertedIndex:
+    """Per-field postings lists (term -> rows, term frequencies) with BM25F scoring"""
+
+    def __init__(self, field_weights=None, k1=BM25_K1, b=BM25_B):
+        self.field_weights = dict(field_weights or FIELD_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+        self.postings = {field: {} for field in self.field_weights}
+        self.field_lengths = {field: array('I') for field in self.field_weights}
+        self.total_lengths = {field: 0 for field in self.field_weights}
+        self.doc_freq = defaultdict(int)
+        self.doc_count = 0
+        # Rows superseded by re-ingested papers; skipped at query time
+        self.deleted = set()
+        # (field, term) -> postings rows as a numpy array, for filtered queries
+        self._row_arrays = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_papers(cls, papers, **kwargs):
+        index = cls(**kwargs)
+        for row, paper in enumerate(papers):
+            index.add(row, paper)
+        return index
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """Index the live rows of a paper store (superseded rows are left out)"""
+        index = cls(**kwargs)
+        for row, paper in iter_live(store):
+            index.add(row, paper)
+        return index
+
+    def add(self, row, paper):
+        """Index one paper; rows must be added in increasing order"""
+        seen_terms = set()
+        for field, text in paper_fields(paper).items():
+            terms = tokenize(text)
+            counts = defaultdict(int)
+            for term in terms:
+                counts[term] += 1
+
+            field_postings = self.postings[field]
+            for term, tf in counts.items():
+                posting = field_postings.get(term)
+                if posting is None:
+                    posting = field_postings[term] = (array('I'), array('H'))
+                posting[0].append(row)
+                posting[1].append(min(tf, 0xFFFF))
+
+            lengths = self.field_lengths[field]
+            if len(lengths) <= row:
+                lengths.extend([0] * (row + 1 - len(lengths)))
+            lengths[row] = len(terms)
+            self.total_lengths[field] += len(terms)
+            seen_terms.update(counts)
+
+        for term in seen_terms:
+            self.doc_freq[term] += 1
+        self.doc_count += 1
+
+    def remove(self, row, paper):
+        """Tombstone a row so it no longer matches any query.
+
+        `paper` is the record the row was indexed from; its terms and field
+        lengths are taken out of the corpus statistics so BM25F idf and
+        length normalization only reflect live documents.
+        """
+        if row in self.deleted:
+            return
+        self.deleted.add(row)
+        seen_terms = set()
+        for field, text in paper_fields(paper).items():
+            self.total_lengths[field] -= self.field_lengths[field][row]
+            seen_terms.update(tokenize(text))
+
+        for term in seen_terms:
+            self.doc_freq[term] -= 1
+            if not self.doc_freq[term]:
+                del self.doc_freq[term]
+        self.doc_count -= 1
+
+    def idf(self, term):
+        df = self.doc_freq.get(term, 0)
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def term_scores(self, term, allowed=None):
+        """BM25F contribution of one term, as a dict of row -> score.
+
+        `allowed` restricts scoring to a sorted uint32 array of rows; it is
+        matched against each postings list with a vectorized binary search
+        from whichever side is shorter, so a narrow filter costs time
+        proportional to its own rows.
+        """
+        scores = {}
+        if term not in self.doc_freq:
+            return scores
+
+        # BM25F: combine length-normalized term frequencies across fields
+        # before applying the saturation function
+        pseudo_tf = defaultdict(float)
+        for field, weight in self.field_weights.items():
+            posting = self.postings[field].get(term)
+            if posting is None:
+                continue
+            lengths = self.field_lengths[field]
+            avg_length = (self.total_lengths[field] / self.doc_count) or 1.0
+            for row, tf in self._filtered(field, term, posting, allowed):
+                if row in self.deleted:
+                    continue
+                norm = 1 - self.b + self.b * lengths[row] / avg_length
+                pseudo_tf[row] += weight * tf / norm
+
+        idf = self.idf(term)
+        for row, tf in pseudo_tf.items():
+            scores[row] = idf * tf / (self.k1 + tf)
+        return scores
+
+    def _posting_rows(self, field, term, rows):
+        """A postings list's rows as a numpy array, cached until the list grows"""
+        key = (field, term)
+        with self._lock:
+            cached = self._row_arrays.get(key)
+            if cached is not None and len(cached) == len(rows):
+                self._row_arrays.move_to_end(key)
+                return cached
+        # View of a private copy: viewing `rows` itself would block appends to it
+        cached = np.frombuffer(rows[:], dtype=np.uint32)
+        with self._lock:
+            self._row_arrays[key] = cached
+            while len(self._row_arrays) > POSTING_CACHE_TERMS:
+                self._row_arrays.popitem(last=False)
+        return cached
+
+    def _filtered(self, field, term, posting, allowed):
+        """(row, tf) pairs of a postings list, restricted to `allowed`"""
+        if allowed is None:
+            return zip(*posting)
+        if not len(allowed):
+            return ()
+        posting_rows, tfs = self._posting_rows(field, term, posting[0]), posting[1]
+        if len(allowed) >= len(posting_rows):
+            # Look each posting up in the filter
+            i = np.minimum(np.searchsorted(allowed, posting_rows), len(allowed) - 1)
+            positions = np.flatnonzero(allowed[i] == posting_rows)
+        else:
+            # Postings are in row order, so look each allowed row up in them
+            i = np.minimum(np.searchsorted(posting_rows, allowed), len(posting_rows) - 1)
+            positions = i[posting_rows[i] == allowed]
+        return zip(posting_rows[positions].tolist(), [tfs[p] for p in positions.tolist()])
+
+    def search(self, query, rows=None):
+        """Score every document matching at least one query term.
+
+        Returns a dict of row -> BM25F score. Cost is proportional to the
+        length of the postings lists of the query terms, or to the number
+        of `rows` when a filter is given.
+        """
+        return self.search_many([query], rows)[0]
+
+    def search_many(self, queries, rows=None):
+        """Score a batch of queries, walking each distinct term's postings once.
+
+        `rows` (sorted) limits scoring to those rows, e.g. a year range.
+        """
+        allowed = None if rows is None else np.asarray(rows, dtype=np.uint32)
+        term_cache = {}
+        results = []
+        for query in queries:
+            scores = defaultdict(float)
+            if self.doc_count:
+                for term in set(tokenize(query)):
+                    contribution = term_cache.get(term)
+                    if contribution is None:
+                        contribution = term_cache[term] = self.term_scores(term, allowed)
+                    for row, score in contribution.items():
+                        scores[row] += score
+            results.append(scores)
+        return results
+
+    def rows_containing(self, terms, fields=None, rows=None):
+        """Live rows whose given fields contain any of `terms`.
+
+        `rows` (a set) restricts the answer to those rows; when it is small
+        next to the terms' postings, each row is probed by binary search
+        instead of walking the postings.
+        """
+        postings = [posting[0] for field in fields or self.field_weights
+                    for posting in map(self.postings[field].get, terms) if posting is not None]
+        if rows is not None and len(rows) * len(postings) < sum(map(len, postings)):
+            matched = set()
+            for row in rows:
+                for posting_rows in postings:
+                    i = bisect_left(posting_rows, row)
+                    if i < len(posting_rows) and posting_rows[i] == row:
+                        matched.add(row)
+                        break
+            return matched - self.deleted
+        matched = set()
+        for posting_rows in postings:
+            matched.update(posting_rows)
+        if rows is not None:
+            matched &= rows
+        return matched - self.deleted
+
+
+def top_k(scores, k):
+    """Best k (row, score) pairs without sorting everything; ties go to lower rows"""
+    return heapq.nlargest(k, scores, key=lambda item: (item[1], -item[0]))
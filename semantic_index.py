@@ -0,0 +1,314 @@
+"""
+BIOLIT INTELLIGENCE - SEMANTIC INDEX (semantic_index.py)
+Dense title+abstract embeddings with an IVF approximate-nearest-neighbour index.
+
+Embeddings are hashed TF-IDF random projections: every term is hashed into
+one of HASH_BUCKETS buckets, weighted by sublinear tf x idf, and projected
+to DIM dimensions through a fixed random matrix (generated from a seed, so
+it never needs to be stored). Vectors are L2-normalized, so a dot product is
+a cosine similarity. No model files, GPU or network access are involved.
+
+The IVF index clusters the vectors with spherical k-means. A query scores
+the centroids, then only the rows in its `nprobe` nearest lists. Raising
+nprobe trades latency for recall; nprobe = nlist is an exact search.
+
+Vectors, centroids, inverted lists and idf weights are computed offline and
+saved as .npy files next to the paper store, then memory-mapped (the vectors
+as float32) by the app:
+
+    python semantic_index.py --store data/paper_store --nlist 1024
+
+Papers ingested after the offline job are embedded on arrival and searched
+exhaustively until the next run.
+"""
+
+import argparse
+import math
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from paper_store import MmapPaperStore
+from search_index import tokenize
+
+SEMANTIC_DIRNAME = 'semantic_index'
+INDEX_ARRAYS = ('vectors', 'centroids', 'list_offsets', 'list_rows', 'idf')
+
+DIM = 256
+HASH_BUCKETS = 1 << 15
+PROJECTION_SEED = 20240517
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 100_000
+EMBED_BATCH = 4096
+
+
+def paper_text(paper):
+    return f"{paper.get('title') or ''} {paper.get('abstract') or ''}"
+
+
+def term_bucket(term):
+    # Stable across processes, unlike hash()
+    return zlib.crc32(term.encode('utf-8')) % HASH_BUCKETS
+
+
+class HashedEmbedder:
+    """Text -> unit float32 vector via hashed TF-IDF and a seeded random projection"""
+
+    def __init__(self, idf=None, dim=DIM, seed=PROJECTION_SEED):
+        self.dim = dim
+        rng = np.random.default_rng(seed)
+        # float16 halves the per-process cost of the matrix; sums are float32
+        self.projection = (rng.standard_normal((HASH_BUCKETS, dim)) / math.sqrt(dim)).astype(np.float16)
+        self.idf = np.ones(HASH_BUCKETS, dtype=np.float32) if idf is None else np.asarray(idf, dtype=np.float32)
+        self._buckets = {}
+
+    @classmethod
+    def fit(cls, texts, **kwargs):
+        """Embedder whose idf weights come from the given corpus texts"""
+        doc_freq = np.zeros(HASH_BUCKETS, dtype=np.int64)
+        count = 0
+        embedder = cls(**kwargs)
+        for text in texts:
+            doc_freq[list(set(map(embedder.bucket, tokenize(text))))] += 1
+            count += 1
+        embedder.idf = np.log((1 + count) / (1 + doc_freq)).astype(np.float32) + 1
+        return embedder
+
+    def bucket(self, term):
+        bucket = self._buckets.get(term)
+        if bucket is None:
+            bucket = self._buckets[term] = term_bucket(term)
+        return bucket
+
+    def embed(self, texts):
+        """(len(texts), dim) float32 array of unit vectors (zero for empty texts)"""
+        texts = list(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), EMBED_BATCH):
+            docs, buckets, weights = [], [], []
+            for i, text in enumerate(texts[start:start + EMBED_BATCH], start):
+                for bucket, tf in Counter(map(self.bucket, tokenize(text))).items():
+                    docs.append(i)
+                    buckets.append(bucket)
+                    weights.append(1 + math.log(tf))
+            if not docs:
+                continue
+            buckets = np.array(buckets, dtype=np.int64)
+            weights = np.array(weights, dtype=np.float32) * self.idf[buckets]
+            np.add.at(vectors, np.array(docs), self.projection[buckets].astype(np.float32) * weights[:, None])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def spherical_kmeans(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=PROJECTION_SEED):
+    """Unit centroids of `nlist` clusters, trained on a sample of the vectors"""
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if len(vectors) > KMEANS_SAMPLE:
+        sample = vectors[np.sort(rng.choice(len(vectors), KMEANS_SAMPLE, replace=False))]
+    sample = np.asarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+    return centroids
+
+
+def assign_lists(vectors, centroids):
+    """(list_offsets, list_rows): rows grouped by nearest centroid"""
+    assignment = np.concatenate([np.argmax(vectors[start:start + EMBED_BATCH * 16] @ centroids.T, axis=1)
+                                 for start in range(0, len(vectors), EMBED_BATCH * 16)] or [np.zeros(0, np.int64)])
+    list_rows = np.argsort(assignment, kind='stable').astype(np.int64)
+    counts = np.bincount(assignment, minlength=len(centroids))
+    return np.concatenate([[0], np.cumsum(counts)]).astype(np.int64), list_rows
+
+
+def build_arrays(store, nlist=None):
+    """Embed every row of the store and build the IVF lists"""
+    embedder = HashedEmbedder.fit(paper_text(paper) for paper in store)
+    vectors = embedder.embed(paper_text(paper) for paper in store)
+    nlist = max(1, min(nlist or int(math.sqrt(len(vectors))), len(vectors)))
+    if len(vectors):
+        centroids = spherical_kmeans(vectors, nlist)
+        list_offsets, list_rows = assign_lists(vectors, centroids)
+    else:
+        centroids = np.zeros((0, embedder.dim), dtype=np.float32)
+        list_offsets, list_rows = np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return {'vectors': vectors, 'centroids': centroids, 'list_offsets': list_offsets,
+            'list_rows': list_rows, 'idf': embedder.idf}
+
+
+def save_index(directory, arrays):
+    target = os.path.join(directory, SEMANTIC_DIRNAME)
+    os.makedirs(target, exist_ok=True)
+    for name in INDEX_ARRAYS:
+        tmp_path = os.path.join(target, f'{name}.tmp.npy')
+        np.save(tmp_path, arrays[name])
+        os.replace(tmp_path, os.path.join(target, f'{name}.npy'))
+
+
+class SemanticIndex:
+    """IVF search over memory-mapped embeddings, plus exhaustive search of newer rows"""
+
+    def __init__(self, arrays, nprobe=DEFAULT_NPROBE):
+        self.vectors = arrays['vectors']
+        self.centroids = arrays['centroids']
+        self.list_offsets = arrays['list_offsets']
+        self.list_rows = arrays['list_rows']
+        self.embedder = HashedEmbedder(arrays['idf'], dim=self.vectors.shape[1])
+        self.nprobe = nprobe
+        # Rows ingested after the offline build: vectors kept in memory
+        self._pending_rows = []
+        self._pending = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self.deleted = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, store, nlist=None, **kwargs):
+        """Index computed in-process (small corpora without an offline index)"""
+        index = cls(build_arrays(store, nlist), **kwargs)
+        index.deleted.update(store.id_index.superseded)
+        return index
+
+    @classmethod
+    def load(cls, directory, store=None, **kwargs):
+        """Memory-map an index saved by save_index(), or None if absent.
+
+        Rows of `store` beyond the saved index are embedded on load.
+        """
+        target = os.path.join(directory or '', SEMANTIC_DIRNAME)
+        if not directory or not os.path.exists(os.path.join(target, 'vectors.npy')):
+            return None
+        index = cls({name: np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r')
+                     for name in INDEX_ARRAYS}, **kwargs)
+        if store is not None:
+            if len(store) > index.indexed_rows:
+                rows = range(index.indexed_rows, len(store))
+                index.add_many(rows, [store.row(row) for row in rows])
+            index.deleted.update(store.id_index.superseded)
+        return index
+
+    @property
+    def indexed_rows(self):
+        return len(self.vectors)
+
+    def __len__(self):
+        return len(self.vectors) + len(self._pending_rows)
+
+    def add_many(self, rows, papers):
+        vectors = self.embedder.embed(paper_text(paper) for paper in papers)
+        with self._lock:
+            self._pending_rows.extend(rows)
+            self._pending = np.concatenate([self._pending, vectors])
+
+    def add(self, row, paper):
+        self.add_many([row], [paper])
+
+    def remove(self, row):
+        """Tombstone a superseded row"""
+        self.deleted.add(row)
+
+    def embed_query(self, text):
+        return self.embedder.embed([text])[0]
+
+    def similarity(self, query_vector, rows):
+        """Cosine similarity of the query to each of `rows` (any order)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        scores = np.zeros(len(rows), dtype=np.float32)
+        indexed = rows < self.indexed_rows
+        if indexed.any():
+            scores[indexed] = self.vectors[rows[indexed]] @ query_vector
+        if not indexed.all():
+            with self._lock:
+                position = {row: i for i, row in enumerate(self._pending_rows)}
+                pending = self._pending
+            for i in np.flatnonzero(~indexed).tolist():
+                j = position.get(int(rows[i]))
+                if j is not None:
+                    scores[i] = pending[j] @ query_vector
+        return scores
+
+    def search(self, text, limit=100, nprobe=None, rows=None):
+        """row -> cosine similarity of the best `limit` rows for `text`.
+
+        `rows` (sorted) restricts the search to a filter; small filters are
+        scored exactly instead of through the IVF lists.
+        """
+        query = self.embed_query(text)
+        if not query.any():
+            return {}
+        if rows is not None and len(rows) <= limit * 20:
+            candidates = np.asarray(rows, dtype=np.int64)
+            scores = self.similarity(query, candidates)
+        else:
+            candidates, scores = self._probe(query, nprobe or self.nprobe)
+            if rows is not None:
+                keep = np.isin(candidates, np.asarray(rows, dtype=np.int64))
+                candidates, scores = candidates[keep], scores[keep]
+
+        if self.deleted:
+            keep = ~np.isin(candidates, np.fromiter(self.deleted, dtype=np.int64))
+            candidates, scores = candidates[keep], scores[keep]
+        keep = scores > 0
+        candidates, scores = candidates[keep], scores[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        return dict(zip(candidates.tolist(), scores.tolist()))
+
+    def _probe(self, query, nprobe):
+        """(rows, scores) from the nearest IVF lists plus every pending row"""
+        parts_rows, parts_scores = [], []
+        if len(self.centroids):
+            nprobe = min(nprobe, len(self.centroids))
+            centroid_scores = self.centroids @ query
+            lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            for lst in lists.tolist():
+                # Row order keeps reads from the memory-mapped vectors sequential
+                list_rows = np.sort(self.list_rows[self.list_offsets[lst]:self.list_offsets[lst + 1]])
+                parts_rows.append(list_rows)
+                parts_scores.append(self.vectors[list_rows] @ query)
+        with self._lock:
+            pending_rows, pending = list(self._pending_rows), self._pending
+        if pending_rows:
+            parts_rows.append(np.array(pending_rows, dtype=np.int64))
+            parts_scores.append(pending @ query)
+        if not parts_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts_rows), np.concatenate(parts_scores)
+
+    def stats(self):
+        return {
+            'rows': len(self),
+            'pending_rows': len(self._pending_rows),
+            'lists': len(self.centroids),
+            'dimensions': self.embedder.dim,
+            'nprobe': self.nprobe,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the semantic search index of a paper store')
+    parser.add_argument('--store', required=True, help='Paper store directory')
+    parser.add_argument('--nlist', type=int, default=None, help='IVF lists (default sqrt of the corpus size)')
+    args = parser.parse_args()
+
+    started = time.time()
+    store = MmapPaperStore(args.store)
+    arrays = build_arrays(store, args.nlist)
+    save_index(args.store, arrays)
+    print(f"Embedded {len(arrays['vectors'])} papers into {len(arrays['centroids'])} lists "
+          f"in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
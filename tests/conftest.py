@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py is imported by some tests; keep it from starting background threads
+os.environ.setdefault('RECOMMENDATION_PRECOMPUTE', '0')
+os.environ.setdefault('STORE_SYNC_SECONDS', '0')
@@ -0,0 +1,92 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize('method, path, body', [
+    ('post', '/api/grants', {'research_area': 'CRISPR', 'limit': 'x'}),
+    ('post', '/api/recommendations/bulk', {'paper_ids': [1], 'limit': 'x'}),
+    ('post', '/api/recommendations/bulk', {'paper_ids': [1], 'limit': [3]}),
+    ('get', '/api/citation-network/1?depth=x', None),
+    ('get', '/api/citation-network/1?limit=1.5', None),
+    ('get', '/api/gaps?limit=x', None),
+    ('get', '/api/authors/typeahead?q=smi&limit=x', None),
+    ('get', '/api/papers?limit=x', None),
+])
+def test_non_integer_parameters_are_rejected(client, method, path, body):
+    response = getattr(client, method)(path, json=body)
+    assert response.status_code == 400
+    assert response.get_json()['message'].endswith('must be an integer')
+
+
+def test_integer_parameters_are_clamped(client):
+    response = client.post('/api/grants', json={'research_area': 'CRISPR', 'limit': '1000'})
+    assert response.status_code == 200
+    response = client.get('/api/citation-network/1?depth=99&limit=0')
+    assert response.get_json()['network']['neighborhood']['depth'] == app.MAX_NETWORK_DEPTH
+
+
+def test_profiler_changes_are_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(app.Config, 'PROFILE_ADMIN_TOKEN', None)
+    response = client.post('/api/metrics/profiler', json={'enabled': True})
+    assert response.status_code == 403
+    assert not app.PROFILER.enabled
+
+
+@pytest.mark.parametrize('headers, body, status', [
+    ({}, {'enabled': True}, 401),
+    ({'Authorization': 'Bearer wrong'}, {'enabled': True}, 401),
+    ({'Authorization': 'Bearer secret'}, {'interval_ms': 0.01}, 400),
+    ({'Authorization': 'Bearer secret'}, {'threshold_ms': 'slow'}, 400),
+    ({'Authorization': 'Bearer secret'}, {'threshold_ms': 1e9}, 400),
+    ({'Authorization': 'Bearer secret'}, {'enabled': 'yes'}, 400),
+    ({'Authorization': 'Bearer secret'}, {'threshold_ms': 250, 'interval_ms': 10}, 200),
+])
+def test_profiler_changes_need_the_admin_token_and_valid_bounds(client, monkeypatch, headers, body, status):
+    monkeypatch.setattr(app.Config, 'PROFILE_ADMIN_TOKEN', 'secret')
+    # Restore the shared profiler's settings afterwards
+    monkeypatch.setattr(app.PROFILER, 'threshold_ms', app.PROFILER.threshold_ms)
+    monkeypatch.setattr(app.PROFILER, 'interval', app.PROFILER.interval)
+    before = app.PROFILER.stats()
+    response = client.post('/api/metrics/profiler', json=body, headers=headers)
+    assert response.status_code == status
+    if status != 200:
+        assert app.PROFILER.stats() == before
+    else:
+        assert app.PROFILER.threshold_ms == 250 and app.PROFILER.interval == 0.01
+
+
+@pytest.mark.parametrize('body, message', [
+    ({'research_area': 123}, 'research_area must be a string'),
+    ({'research_area': ['CRISPR']}, 'research_area must be a string'),
+    ({'research_area': 'CRISPR', 'keywords': 'CRISPR'}, 'keywords must be a list of strings'),
+    ({'research_area': 'CRISPR', 'keywords': ['CRISPR', 7]}, 'keywords must be a list of strings'),
+    ({'research_area': 'CRISPR', 'paper_id': [1]}, 'paper_id must be an integer'),
+])
+def test_grant_parameters_of_the_wrong_type_are_rejected(client, body, message):
+    response = client.post('/api/grants', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
+
+
+def test_grant_keywords_list_is_accepted(client):
+    response = client.post('/api/grants', json={'research_area': 'CRISPR', 'keywords': ['gene editing']})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('paper_ids', [[[1]], [1, {'id': 2}], ['1'], [True], [1.5]])
+def test_bulk_recommendations_reject_non_integer_ids(client, paper_ids):
+    response = client.post('/api/recommendations/bulk', json={'paper_ids': paper_ids})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Every paper_id must be an integer'
+
+
+def test_bulk_recommendations_report_unknown_ids(client):
+    response = client.post('/api/recommendations/bulk', json={'paper_ids': [1, 999999]})
+    assert response.status_code == 200
+    assert response.get_json()['not_found'] == [999999]
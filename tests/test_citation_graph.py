@@ -0,0 +1,23 @@
+from citation_graph import CitationGraph
+from paper_store import MemoryPaperStore
+
+
+def paper(paper_id, references=()):
+    return {'id': paper_id, 'title': '', 'authors': [], 'year': 2024, 'journal': '', 'citations': 0,
+            'impact_factor': 0, 'abstract': '', 'keywords': [], 'h_index': 0, 'references': list(references)}
+
+
+def test_supersede_batch_moves_citations_to_new_rows():
+    store = MemoryPaperStore([paper(1, [2, 3]), paper(2, [3]), paper(3), paper(4, [9])])
+    graph = CitationGraph.from_store(store)
+    assert graph.cited_by(2).tolist() == [0, 1]
+
+    rows = store.append([paper(2, [1]), paper(3)])
+    graph.add_rows(store, rows)
+    graph.supersede({1: 4, 2: 5})
+
+    assert graph.cites(0).tolist() == [4, 5]
+    assert graph.cites(1).tolist() == []
+    assert graph.cites(4).tolist() == [0]
+    assert sorted(graph.cited_by(5).tolist()) == [0]
+    assert graph.edge_count == 3
@@ -0,0 +1,41 @@
+from gap_analysis import TopicTimeSeries
+from paper_store import MemoryPaperStore
+
+
+def paper(paper_id, year, keywords, citations=10):
+    return {'id': paper_id, 'title': '', 'authors': [], 'year': year, 'journal': '', 'citations': citations,
+            'impact_factor': 0, 'abstract': '', 'keywords': keywords, 'h_index': 0, 'references': []}
+
+
+def test_unknown_years_are_skipped():
+    store = MemoryPaperStore([paper(1, 2023, ['CRISPR']), paper(2, 0, ['CRISPR']), paper(3, 2024, ['CRISPR'])])
+    series = TopicTimeSeries.from_store(store)
+    assert sorted(series.year_rows) == [2023, 2024]
+    gaps, year = series.analyze()
+    assert year == 2024
+    assert gaps[0]['saturation_level'].endswith('(2 papers)')
+
+
+def test_removal_prunes_cooccurrence():
+    store = MemoryPaperStore([paper(1, 2024, ['CRISPR', 'cancer']), paper(2, 2024, ['CRISPR', 'cancer', 'safety'])])
+    series = TopicTimeSeries.from_store(store)
+    crispr = series.topic_ids['crispr']
+    assert dict(series.cooccurrence[crispr]) == {series.topic_ids['cancer']: 2, series.topic_ids['safety']: 1}
+
+    series.remove_row(store, 1)
+    assert dict(series.cooccurrence[crispr]) == {series.topic_ids['cancer']: 1}
+    assert series.field_topics('safety').tolist() == [series.topic_ids['safety']]
+
+
+def test_outlier_years_take_one_row_each():
+    store = MemoryPaperStore([paper(1, 5, ['CRISPR']), paper(2, 2021, ['CRISPR']), paper(3, 2024, ['CRISPR']),
+                              paper(4, 2024, ['CRISPR', 'cancer'])])
+    series = TopicTimeSeries.from_store(store)
+    assert series.counts.shape[0] == series.stats()['years'] == 3
+
+    gaps, year = series.analyze()
+    crispr = next(gap for gap in gaps if gap['topic'] == 'CRISPR')
+    assert (crispr['year'], crispr['current_papers']) == (2024, 2)
+    # Years without papers read as zeros, so 2023 -> 2024 is 100% growth
+    assert crispr['growth_rate'] == '100% YoY'
+    assert crispr['trend'] == {'2020': 0, '2021': 1, '2022': 0, '2023': 0, '2024': 2}
@@ -0,0 +1,39 @@
+import json
+
+from ingest import ingest
+from paper_store import MmapPaperStore
+from search_index import InvertedIndex
+
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+
+def test_ingest_appends_to_store_and_skips_records_without_a_year(tmp_path):
+    source = write_ndjson(tmp_path / 'papers.ndjson', [
+        {'id': 1, 'title': 'CRISPR screens', 'year': 2021},
+        {'id': 2, 'title': 'No year'},
+        {'id': 3, 'title': 'Bad year', 'year': 'n.d.'},
+        {'id': 4, 'title': 'Zero year', 'year': 0},
+    ])
+    store = MmapPaperStore.create(str(tmp_path / 'store'), index_ids=False)
+
+    ingested, skipped, _ = ingest([source], store.append)
+
+    assert (ingested, skipped) == (1, 3)
+    assert store.count == 1 and store.id_index.superseded == set()
+
+
+def test_reingested_ids_are_superseded_when_the_server_opens_the_store(tmp_path):
+    directory = str(tmp_path / 'store')
+    store = MmapPaperStore.create(directory, index_ids=False)
+    ingest([write_ndjson(tmp_path / 'a.ndjson', [{'id': 1, 'title': 'CRISPR screens', 'year': 2021}])],
+           store.append)
+    ingest([write_ndjson(tmp_path / 'b.ndjson', [{'id': 1, 'title': 'CRISPR screens revisited', 'year': 2022}])],
+           store.append)
+    store.close()
+
+    store = MmapPaperStore(directory)
+    assert store.id_index.superseded == {0}
+    assert set(InvertedIndex.from_store(store).search('crispr')) == {1}
@@ -0,0 +1,81 @@
+import httpx
+import pytest
+
+import app
+from llm_client import AsyncLLMClient, LLMError
+from notes_cache import NotesCache
+
+
+def completion(content):
+    return {'choices': [{'message': {'role': 'assistant', 'content': content}}]}
+
+
+def make_client(handler, **kwargs):
+    return AsyncLLMClient('test', base_url='http://llm.test/v1', backoff=0,
+                          transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_complete_retries_transient_statuses():
+    statuses = iter([503, 429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json=completion('ok') if status == 200 else {})
+
+    client = make_client(handler, max_retries=2)
+    assert client.complete('hi') == 'ok'
+    assert client.stats()['retries'] == 2
+
+
+@pytest.mark.parametrize('response', [
+    httpx.Response(200, text='<html>Bad gateway</html>'),
+    httpx.Response(200, json={'choices': []}),
+    httpx.Response(401, json={'error': 'unauthorized'}),
+    httpx.Response(503, json={}),
+])
+def test_failures_raise_llm_error(response):
+    client = make_client(lambda request: response, max_retries=1)
+    with pytest.raises(LLMError):
+        client.complete('hi')
+    assert client.stats()['failures'] == 1
+
+
+def test_unexpected_errors_are_wrapped():
+    def handler(request):
+        raise RuntimeError('boom')
+
+    with pytest.raises(LLMError):
+        make_client(handler).complete('hi')
+
+
+def test_complete_many_returns_errors_per_item():
+    def handler(request):
+        if b'bad' in request.content:
+            return httpx.Response(200, text='not json')
+        return httpx.Response(200, json=completion('ok'))
+
+    results = make_client(handler).complete_many(['good', 'bad'])
+    assert results[0] == 'ok'
+    assert isinstance(results[1], LLMError)
+
+
+@pytest.fixture
+def failing_llm(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'LLM_CLIENT', make_client(lambda request: httpx.Response(200, text='oops')))
+    monkeypatch.setattr(app, 'NOTES_CACHE', NotesCache(str(tmp_path)))
+    monkeypatch.setattr(app.RESPONSE_CACHE, 'backend', app.MemoryCacheBackend(0))
+    return app.app.test_client()
+
+
+def test_notes_fall_back_to_template(failing_llm):
+    response = failing_llm.post('/api/generate-notes', json={'paper_id': 1})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['notes'] == app.template_notes(app.PAPER_STORE.get(1))
+    assert data['cached'] is False
+
+
+def test_credibility_check_keeps_offline_explanation(failing_llm):
+    response = failing_llm.post('/api/credibility-check', json={'claim': 'Coffee improves memory in mice'})
+    assert response.status_code == 200
+    assert response.get_json()['analysis']['explanation'].startswith('Claim appears reasonable')
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+from notes_cache import NotesCache
+
+KEY = 'ab' + '0' * 62
+
+
+def files(directory, suffix):
+    return [name for _, _, names in os.walk(directory) for name in names if name.endswith(suffix)]
+
+
+def slow_generator(calls, notes='notes', delay=0.2):
+    def generate():
+        calls.append(1)
+        time.sleep(delay)
+        return notes
+    return generate
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_requests_generate_once(tmp_path):
+    cache = NotesCache(str(tmp_path))
+    calls = []
+    results = run_concurrently(8, lambda: cache.get_or_generate(KEY, slow_generator(calls)))
+
+    assert len(calls) == 1
+    assert [entry['notes'] for entry, _ in results] == ['notes'] * 8
+    assert sorted(cached for _, cached in results) == [False] + [True] * 7
+    stats = cache.stats()
+    assert (stats['misses'], stats['hits'] + stats['coalesced']) == (1, 7)
+    assert files(tmp_path, '.lock') == []
+
+
+def test_workers_sharing_a_directory_generate_once(tmp_path):
+    # Two caches on one directory stand in for two gunicorn workers
+    caches = [NotesCache(str(tmp_path)), NotesCache(str(tmp_path))]
+    calls = []
+    results = run_concurrently(2, lambda: caches[len(calls) % 2].get_or_generate(KEY, slow_generator(calls)))
+
+    assert len(calls) == 1
+    assert {entry['notes'] for entry, _ in results} == {'notes'}
+    assert files(tmp_path, '.lock') == []
+
+
+def test_stream_follower_waits_for_leader(tmp_path):
+    cache = NotesCache(str(tmp_path))
+    calls = []
+
+    def stream():
+        calls.append(1)
+        for word in ('one ', 'two'):
+            time.sleep(0.1)
+            yield word
+
+    results = run_concurrently(4, lambda: list(cache.stream_or_get(KEY, stream)))
+    assert len(calls) == 1
+    assert sorted(results) == [[('one ', False), ('two', False)]] + [[('one two', True)]] * 3
+
+
+def test_abandoned_stream_lets_followers_retry(tmp_path):
+    cache = NotesCache(str(tmp_path))
+    leader = cache.stream_or_get(KEY, lambda: iter(['partial ', 'rest']))
+    next(leader)
+    leader.close()
+
+    entry, cached = cache.get_or_generate(KEY, lambda: 'fresh')
+    assert (entry['notes'], cached) == ('fresh', False)
+
+
+def test_generation_errors_reach_followers(tmp_path):
+    cache = NotesCache(str(tmp_path))
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError('LLM down')
+
+    def call():
+        try:
+            return cache.get_or_generate(KEY, fail)
+        except RuntimeError as e:
+            return str(e)
+
+    assert run_concurrently(3, call) == ['LLM down'] * 3
+    assert cache.get(KEY) is None
+
+
+def test_overwrite_counts_bytes_once(tmp_path):
+    cache = NotesCache(str(tmp_path))
+    cache.put(KEY, {'notes': 'x' * 100})
+    cache.put(KEY, {'notes': 'y' * 50})
+    assert cache.total_bytes == sum(os.path.getsize(os.path.join(root, name))
+                                    for root, _, names in os.walk(tmp_path) for name in names)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = NotesCache(str(tmp_path), max_bytes=1000)
+    keys = [f'{i:02d}' + '0' * 62 for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, {'notes': 'x' * 200})
+        os.utime(cache._path(key), (i, i))
+        if i == 3:
+            # Reading an entry refreshes it
+            assert cache.get(keys[0]) is not None
+
+    assert cache.evictions >= 1
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.total_bytes <= 900
+    assert cache.total_bytes == sum(size for _, size, _ in cache._scan())
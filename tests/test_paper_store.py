@@ -0,0 +1,54 @@
+from author_index import AuthorIndex
+from citation_graph import CitationGraph
+from gap_analysis import TopicTimeSeries
+from paper_export import read_page
+from paper_store import MmapPaperStore
+from range_index import SortedColumnIndex
+from recommender import KeywordMatrix
+from search_index import InvertedIndex
+from semantic_index import SemanticIndex
+
+
+def paper(paper_id, title, citations=10, year=2023, references=()):
+    return {
+        'id': paper_id,
+        'title': title,
+        'authors': ['Smith, J.'],
+        'year': year,
+        'journal': 'Bioinformatics',
+        'citations': citations,
+        'impact_factor': 8.2,
+        'abstract': f'{title} abstract',
+        'keywords': ['CRISPR', 'genomics'],
+        'h_index': 10,
+        'references': list(references),
+    }
+
+
+def test_superseded_rows_stay_out_of_indexes_after_restart(tmp_path):
+    store = MmapPaperStore.create(str(tmp_path))
+    store.append([paper(1, 'CRISPR screens'), paper(2, 'CRISPR delivery', references=[1])])
+    store.append([paper(1, 'CRISPR screens revisited')])
+    store.close()
+
+    # Restart: reopen the store and build every index from it
+    store = MmapPaperStore(str(tmp_path))
+    assert store.id_index.superseded == {0}
+    assert [row for row, _ in read_page(store, 0, 10)[0]] == [1, 2]
+
+    assert set(InvertedIndex.from_store(store).search('crispr')) == {1, 2}
+    assert SemanticIndex.build(store).search('crispr screens').keys() <= {1, 2}
+    assert KeywordMatrix.from_store(store).similar(1) == (1, [(2, 100.0)])
+    assert SortedColumnIndex.from_store(store, 'year').between(2023).tolist() == [1, 2]
+
+    graph = CitationGraph.from_store(store)
+    assert graph.cites(1).tolist() == [2]
+    assert graph.cited_by(0).tolist() == []
+
+    author = AuthorIndex.from_store(store).profile('Smith, J.', store)
+    assert author['total_publications'] == 2
+    assert author['total_citations'] == 20
+
+    gaps, year = TopicTimeSeries.from_store(store).analyze(limit=5)
+    assert year == 2023
+    assert {gap['topic']: gap['current_papers'] for gap in gaps} == {'CRISPR': 2, 'genomics': 2}
@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+
+from recommender import KeywordMatrix, RecommendationCache
+
+KEYWORDS = [['CRISPR', 'cancer'], ['CRISPR'], ['mRNA', 'vaccines'], ['cancer', 'immunotherapy'], ['mRNA']]
+
+
+def matrix_of(rows):
+    matrix = KeywordMatrix()
+    for row, keywords in enumerate(rows):
+        matrix.add(row, keywords)
+    return matrix
+
+
+def test_buffered_replacements_match_a_fresh_build():
+    matrix = matrix_of(KEYWORDS)
+    matrix.similar(0)
+    matrix.add(5, ['vaccines', 'CRISPR'])
+    # Replace an indexed row, a pending row and clear one, then rebuild once
+    matrix.set_keywords(1, ['vaccines'])
+    matrix.set_keywords(5, ['cancer'])
+    matrix.set_keywords(2, ())
+
+    fresh = matrix_of([KEYWORDS[0], ['vaccines'], [], KEYWORDS[3], KEYWORDS[4], ['cancer']])
+    for row in range(6):
+        assert [matrix.keywords[c] for c in matrix.row_keywords(row)] == \
+               [fresh.keywords[c] for c in fresh.row_keywords(row)]
+        assert matrix.similar(row) == fresh.similar(row)
+    assert np.array_equal(matrix.neighbors_many([5]), fresh.neighbors_many([5]))
+
+
+def test_warm_up_computes_every_row_without_versioning_them():
+    cache = RecommendationCache(matrix_of(KEYWORDS), limit=2)
+    cache.start()
+    deadline = time.time() + 5
+    while cache.stats()['entries'] < len(KEYWORDS) and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert cache.stats()['entries'] == len(KEYWORDS)
+    assert cache.stats()['warming'] == 0
+    assert cache._row_versions == {}
+    assert cache.get(0) == (2, [(1, 50.0), (3, 50.0)])
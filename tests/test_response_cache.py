@@ -0,0 +1,122 @@
+import time
+
+import pytest
+import flask
+from flask import Flask, jsonify
+
+from response_cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the get/set/incr subset of a Redis client"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        assert isinstance(value, bytes)
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1).encode()
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def client(request):
+    backend = MemoryCacheBackend(max_entries=2) if request.param == 'memory' else RedisCacheBackend(client=FakeRedis())
+    cache = ResponseCache(backend, ttl=60)
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/items', methods=['GET', 'POST'])
+    @cache.cached('query', 'cursor', text=('query',))
+    def items():
+        data = flask.request.get_json(silent=True) or {}
+        calls.append(data.get('query', flask.request.args.get('cursor')))
+        return jsonify({'calls': len(calls)})
+
+    test_client = app.test_client()
+    test_client.cache, test_client.calls = cache, calls
+    return test_client
+
+
+def test_hit_miss_and_etag(client):
+    first = client.post('/items', json={'query': 'CRISPR  Cancer'})
+    assert first.headers['X-Cache'] == 'MISS'
+    second = client.post('/items', json={'query': 'crispr cancer'})
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json() == {'calls': 1}
+    assert second.headers['ETag'] == first.headers['ETag']
+
+    conditional = client.post('/items', json={'query': 'crispr cancer'},
+                              headers={'If-None-Match': first.headers['ETag']})
+    assert conditional.status_code == 304
+    assert client.cache.stats()['not_modified'] == 1
+
+
+def test_opaque_fields_are_not_normalized(client):
+    client.get('/items?cursor=eyJyb3ciOjF9')
+    response = client.get('/items?cursor=EYJROWI6MX0')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert client.calls == ['eyJyb3ciOjF9', 'EYJROWI6MX0']
+
+
+def test_invalidate_drops_entries(client):
+    client.post('/items', json={'query': 'a'})
+    client.cache.invalidate()
+    assert client.post('/items', json={'query': 'a'}).headers['X-Cache'] == 'MISS'
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+    assert backend.get('b') is None
+    assert (backend.get('a'), backend.get('c')) == (1, 3)
+    assert backend.evictions == 1
+
+    backend.set('d', 4, -1)
+    assert backend.get('d') is None
+
+
+def test_redis_backend_stores_json_not_pickle():
+    redis = FakeRedis()
+    backend = RedisCacheBackend(client=redis, prefix='p:')
+    backend.set('k', (b'{"a":1}', 'application/json', 'etag'), 60)
+    assert redis.values['p:k'] == b'{"mimetype":"application/json","etag":"etag"}\n{"a":1}'
+    assert backend.get('k') == (b'{"a":1}', 'application/json', 'etag')
+
+    redis.values['p:k'] = b'\x80\x04\x95 not json'
+    assert backend.get('k') is None
+
+
+def test_hits_report_their_own_response_time():
+    cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+    app = Flask(__name__)
+
+    @app.before_request
+    def start_clock():
+        # Pretend the request started X-Started-Ago seconds ago
+        flask.g.request_started = time.perf_counter() - float(flask.request.headers.get('X-Started-Ago', 0))
+
+    @app.route('/search', methods=['POST'])
+    @cache.cached('query', elapsed='response_time_ms')
+    def search():
+        return jsonify({'query': flask.request.get_json()['query']})
+
+    client = app.test_client()
+    miss = client.post('/search', json={'query': 'crispr'}, headers={'X-Started-Ago': '2'})
+    hit = client.post('/search', json={'query': 'crispr'})
+    assert miss.get_json()['response_time_ms'] >= 2000
+    assert hit.headers['X-Cache'] == 'HIT'
+    assert hit.get_json()['query'] == 'crispr' and hit.get_json()['response_time_ms'] < 2000
+
+    # The timing field does not change the (weak) ETag
+    assert hit.headers['ETag'] == miss.headers['ETag'] and hit.headers['ETag'].startswith('W/')
+    conditional = client.post('/search', json={'query': 'crispr'}, headers={'If-None-Match': hit.headers['ETag']})
+    assert conditional.status_code == 304
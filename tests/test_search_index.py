@@ -0,0 +1,69 @@
+import numpy as np
+
+from search_index import InvertedIndex
+
+
+def paper(title, keywords=(), abstract=''):
+    return {'title': title, 'keywords': list(keywords), 'abstract': abstract}
+
+
+def test_remove_restores_corpus_statistics():
+    papers = [
+        paper('CRISPR editing in cancer', ['CRISPR']),
+        paper('mRNA vaccines', ['vaccines'], 'personalized cancer immunotherapy'),
+    ]
+    replacement = paper('CRISPR off-target effects', ['CRISPR', 'safety'])
+
+    index = InvertedIndex.from_papers(papers)
+    index.add(2, replacement)
+    index.remove(0, papers[0])
+    # Removing twice must not subtract the statistics again
+    index.remove(0, papers[0])
+
+    fresh = InvertedIndex.from_papers([papers[1], replacement])
+    assert index.doc_count == fresh.doc_count == 2
+    assert index.total_lengths == fresh.total_lengths
+    assert dict(index.doc_freq) == dict(fresh.doc_freq)
+
+    scores = index.search('crispr cancer')
+    fresh_scores = fresh.search('crispr cancer')
+    assert set(scores) == {1, 2}
+    assert scores[2] == fresh_scores[1]
+    assert scores[1] == fresh_scores[0]
+
+
+def test_rows_containing_probes_or_walks_to_the_same_answer():
+    index = InvertedIndex.from_papers([
+        paper('CRISPR did not improve survival'),
+        paper('CRISPR improves survival'),
+        paper('Base editing', abstract='however the effect was small'),
+        paper('Prime editing'),
+    ])
+    terms = ('not', 'however')
+    assert index.rows_containing(terms, ('title', 'abstract')) == {0, 2}
+    # One candidate: probed by binary search
+    assert index.rows_containing(terms, ('title', 'abstract'), rows={2}) == {2}
+    # Many candidates: postings walked and intersected
+    assert index.rows_containing(terms, ('title', 'abstract'), rows={0, 1, 2, 3}) == {0, 2}
+    index.remove(0, paper('CRISPR did not improve survival'))
+    assert index.rows_containing(terms, ('title', 'abstract'), rows={0, 1}) == set()
+
+
+def test_filtered_search_matches_unfiltered_scores_on_the_filter():
+    papers = [paper(f'CRISPR study {row}', ['CRISPR'] if row % 3 else []) for row in range(50)]
+    index = InvertedIndex.from_papers(papers)
+    full = index.search('crispr')
+
+    # Narrow filters probe the postings, broad ones look the postings up in the filter
+    for rows in ([], [7], [0, 5, 49], list(range(0, 50, 2)), list(range(50)), np.arange(10, 40)):
+        expected = {row: score for row, score in full.items() if row in set(np.asarray(rows).tolist())}
+        assert dict(index.search('crispr', rows)) == expected
+
+
+def test_filtered_search_sees_rows_added_after_the_postings_were_cached():
+    index = InvertedIndex.from_papers([paper('CRISPR screens'), paper('mRNA vaccines')])
+    assert set(index.search('crispr', [0, 1])) == {0}
+
+    index.add(2, paper('CRISPR delivery'))
+    assert set(index.search('crispr', [0, 1, 2])) == {0, 2}
+    assert set(index.search('crispr', np.arange(1, 3))) == {2}
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from paper_store import MmapPaperStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter: app.py builds its indexes from PAPER_STORE_DIR
+# at import, so it cannot share this process's already-imported app module
+SERVER_SCRIPT = textwrap.dedent('''
+    import json, sys
+    import app
+    from ingest import ingest
+    from paper_store import MmapPaperStore
+
+    client = app.app.test_client()
+    before = client.post('/api/search', json={'query': 'prime editing'}).get_json()['total_results']
+
+    # ingest.py appends through its own store handle while the app is running
+    writer = MmapPaperStore(sys.argv[1], index_ids=False)
+    ingest([sys.argv[2]], writer.append)
+    synced = app.sync_store()
+
+    def titles(body):
+        return sorted(paper['title'] for paper in body['papers'])
+
+    print(json.dumps({
+        'before': before,
+        'synced': list(synced),
+        'search': titles(client.post('/api/search', json={'query': 'prime editing'}).get_json()),
+        'old_title': client.post('/api/search', json={'query': 'delivery'}).get_json()['total_results'],
+        'author': client.get('/api/author-impact/Okafor, N.').get_json()['author']['total_publications'],
+        'recommendations': [paper['id'] for paper in
+                            client.get('/api/recommendations/1').get_json()['recommendations']],
+        'second_sync': list(app.sync_store()),
+    }))
+''')
+
+
+def paper(paper_id, title, authors, keywords, year=2023):
+    return {'id': paper_id, 'title': title, 'authors': authors, 'year': year, 'journal': 'Cell',
+            'citations': 5, 'impact_factor': 9.1, 'abstract': f'{title} abstract',
+            'keywords': keywords, 'h_index': 10, 'references': []}
+
+
+def test_running_app_indexes_rows_appended_by_ingest(tmp_path):
+    directory = str(tmp_path / 'store')
+    store = MmapPaperStore.create(directory)
+    store.append([
+        paper(1, 'CRISPR screens in T cells', ['Smith, J.'], ['CRISPR', 'immunology']),
+        paper(2, 'Lipid nanoparticle delivery', ['Lee, K.'], ['delivery', 'mRNA']),
+    ])
+    store.close()
+    source = tmp_path / 'new.ndjson'
+    source.write_text(''.join(json.dumps(record) + '\n' for record in [
+        paper(3, 'Prime editing of CRISPR targets', ['Okafor, N.'], ['CRISPR', 'prime editing']),
+        # Re-ingested id: replaces paper 2's old row
+        paper(2, 'Prime editing in the liver', ['Okafor, N.'], ['prime editing', 'liver']),
+    ]))
+
+    env = dict(os.environ, PAPER_STORE_DIR=directory, RECOMMENDATION_PRECOMPUTE='0',
+               STORE_SYNC_SECONDS='0', RESPONSE_CACHE_MAX_ENTRIES='0')
+    result = subprocess.run([sys.executable, '-c', SERVER_SCRIPT, directory, str(source)],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    body = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert body['before'] == 0
+    assert body['synced'] == [2, 3]
+    assert body['search'] == ['Prime editing in the liver', 'Prime editing of CRISPR targets']
+    assert body['old_title'] == 0
+    assert body['author'] == 2
+    assert 3 in body['recommendations']
+    assert body['second_sync'] == []